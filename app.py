@@ -278,22 +278,15 @@ def create_app(config_object=Config):
         return send_from_directory(os.path.join(app.root_path, 'static'), 'favicon.ico', mimetype='image/x-icon')
 
     # Example API endpoints that rely on services
-    @app.route('/api/goals/prioritized')
-    @login_required
-    def get_prioritized_goals():
-        if mongo.db is None:
-            return jsonify({'error': 'Database connection error.'}), 500
-        goals = Goal.get_prioritized(current_user.id, mongo.db)
-        return jsonify(goals)
-
     @app.route('/api/goals/<goal_id>/ai-plan', methods=['GET'])
     @login_required
     def get_goal_ai_plan(goal_id):
         goal_doc = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id})
         if not goal_doc:
             return jsonify({'error': 'Not found'}), 404
-        if goal_doc.get('ai_plan'):
-            return jsonify({'plan': goal_doc.get('ai_plan'), 'offloaded': False})
+        plan = Goal.get_ai_plan(goal_doc)
+        if plan:
+            return jsonify({'plan': plan, 'offloaded': False})
         url = goal_doc.get('ai_plan_paste_url')
         if url and pastebin_client:
             key = pastebin_client.extract_paste_key(url)
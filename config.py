@@ -107,6 +107,16 @@ class Config:
         "on",
     }
 
+    # Pin list queries to their intended compound index via cursor.hint().
+    # A hint is only sent once the index is confirmed to exist, and a rejected
+    # hint falls back to the unhinted query (utils.db_indexes.list_with_hint).
+    MONGO_QUERY_HINTS = str(os.getenv("MONGO_QUERY_HINTS", "1")).lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
     # Image hosting: IMAGEKIT is the preferred option. Provide keys/endpoints
     # via environment variables. IMGBB support has been removed.
     IMAGEKIT_PRIVATE_KEY = os.getenv("IMAGEKIT_PRIVATE_KEY", "")
@@ -87,11 +87,12 @@ class PurchaseAdvice:
 
     @staticmethod
     def get_impact_on_goals(user_id, db):
-        # Fetch user's active (incomplete) goals
+        # Fetch user's active (incomplete) goals; the stored ai_plan (compressed bytes)
+        # is never used here and would not serialize to JSON
         goals = list(db.goals.find({
             'user_id': user_id,
             'is_completed': False
-        }))
+        }, {'ai_plan': 0}))
 
         # Sum amounts for advice entries that recommended not purchasing ('no')
         pipeline = [
@@ -5,6 +5,7 @@ from bson import ObjectId
 import re
 
 from utils.timezone_utils import now_utc
+from utils.db_indexes import list_with_hint
 
 
 class Blog:
@@ -113,6 +114,7 @@ class Blog:
         skip: int = 0,
         limit: int = 20,
         sort: str = "created_desc",
+        hint: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], int]:
         col = db[cls.entries_collection]
         base: Dict[str, Any] = {"user_id": user_id}
@@ -148,7 +150,9 @@ class Blog:
         mongo_sort = sort_map.get(sort, sort_map["created_desc"])
         total = col.count_documents(filt)
         cur = col.find(filt).sort(mongo_sort).skip(skip).limit(limit)
-        return list(cur), total
+        # Force the intended compound index (the planner can otherwise pick a COLLSCAN);
+        # skipped or retried unhinted when the index is not available
+        return list_with_hint(cur, hint), total
 
     @classmethod
     def list_categories(cls, user_id: str, db) -> List[Dict[str, Any]]:
@@ -13,11 +13,18 @@ from bson import ObjectId
 from pydantic import BaseModel, Field, field_validator
 from utils.timezone_utils import now_utc, ensure_utc
 from models.blog import Blog
+from config import Config
 
 DIARY_CATEGORY_MAX = 64
 DIARY_CONTENT_MAX = 32000  # generous
 DIARY_COMMENT_MAX = 4000
 
+# Index names (see utils/db_indexes.py) matching the pinned-first sort used by
+# Blog.list_docs. Only sorts with a fully matching index are hinted.
+_LIST_HINTS: Dict[str, str] = {
+    'created_desc': 'diary_user_pinned_desc',
+}
+
 class DiaryBase(BaseModel):
     user_id: str
     title: Optional[str] = Field(default=None, max_length=512)
@@ -155,7 +162,9 @@ class Diary:
 
     @staticmethod
     def list(user_id: str, db, *, q: str | None = None, category: str | None = None, skip: int = 0, limit: int = 20, sort: str = 'created_desc') -> tuple[list[DiaryInDB], int]:
-        docs, total = Diary._B.list_docs(user_id, db, q=q, category=category, skip=skip, limit=limit, sort=sort)
+        # Text search uses regex over content; leave planning to Mongo in that case
+        hint = _LIST_HINTS.get(sort) if (Config.MONGO_QUERY_HINTS and not q) else None
+        docs, total = Diary._B.list_docs(user_id, db, q=q, category=category, skip=skip, limit=limit, sort=sort, hint=hint)
         return [DiaryInDB(**d) for d in docs], total
 
     @staticmethod
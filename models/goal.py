@@ -3,23 +3,197 @@ and background AI enrichment for financial goals.
 """
 
 from bson import ObjectId
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Union, Literal
-from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from typing import Optional, Dict, Any, List, Union, Literal, TypedDict, Annotated
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter, field_validator
+from config import Config
 from models.user import User
 from utils.timezone_utils import now_utc, ensure_utc, parse_date_only, parse_datetime_any
 from utils.finance_calculator import calculate_lifetime_transaction_summary
 from utils.currency import currency_service
-from pymongo import ReturnDocument
+from utils.db_indexes import list_with_hint
+from pymongo import ReturnDocument, UpdateOne
 import asyncio
+import concurrent.futures
+import heapq
+import logging
+import os
+import re
 import threading
-import traceback
+import time
+import zlib
 
 # Lazy imports inside AI methods to avoid circular dependencies where possible
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=2048)
+def _oid_from_str(goal_id: str) -> ObjectId:
+    return ObjectId(goal_id)
+
+
+def _oid(goal_id: Union[str, ObjectId]) -> ObjectId:
+    """Return goal_id as an ObjectId; ObjectIds pass through, hex strings are cached.
+
+    Raises:
+        bson.errors.InvalidId: If goal_id is not a valid ObjectId (not cached).
+    """
+    if isinstance(goal_id, ObjectId):
+        return goal_id
+    return _oid_from_str(goal_id)
+
+
+# --- User snapshot cache for AI enrichment ---
+# Only the profile fields User() and the AI prompt builders read; skips credentials etc.
+_USER_SNAPSHOT_PROJECTION: Dict[str, int] = {
+    'email': 1,
+    'name': 1,
+    'language': 1,
+    'created_at': 1,
+    'occupation': 1,
+    'usual_income_date': 1,
+    'monthly_income': 1,
+    'default_currency': 1,
+    'monthly_income_currency': 1,
+    'sort_modes': 1,
+}
+_USER_SNAPSHOT_TTL_SECONDS = 60
+_USER_SNAPSHOT_MAX = 1024
+_user_snapshots: Dict[str, tuple[float, User]] = {}
+
+
+def _get_user_snapshot(user_id_str: str, db) -> Optional[User]:
+    """Return a short-lived (60s) cached User for AI enrichment, or None if not found.
+
+    Bulk revalidation enriches many goals of one user back to back; this avoids a
+    users round-trip per goal.
+    """
+    now = time.monotonic()
+    hit = _user_snapshots.get(user_id_str)
+    if hit and hit[0] > now and hit[1].db is db:
+        return hit[1]
+    user_doc = db.users.find_one({'_id': _oid(user_id_str)}, _USER_SNAPSHOT_PROJECTION)
+    if not user_doc:
+        return None
+    user_obj = User(user_doc, db)
+    if len(_user_snapshots) >= _USER_SNAPSHOT_MAX:
+        _user_snapshots.clear()
+    _user_snapshots[user_id_str] = (now + _USER_SNAPSHOT_TTL_SECONDS, user_obj)
+    return user_obj
+
+
+# --- Shared background event loop for AI enrichment ---
+# One long-lived loop on a daemon thread schedules enrichment, paste cleanup and the
+# batched writer. The user snapshot and financial context are blocking Mongo reads,
+# so enrichment runs them on a bounded worker pool (_AI_MAX_CONCURRENCY threads); the
+# AI engine offloads its own synchronous SDK call, so its coroutines run on the loop.
+# Started lazily (and restarted per PID) so gunicorn workers forked after import each
+# get a live loop thread and pool.
+_AI_MAX_CONCURRENCY = 8
+_AI_LOOP: asyncio.AbstractEventLoop | None = None
+_AI_LOOP_PID: int | None = None
+_AI_LOOP_LOCK = threading.Lock()
+_AI_EXECUTOR: concurrent.futures.ThreadPoolExecutor | None = None
+# Caps enrichments in flight on the loop (AI calls + Mongo reads), not just pool threads
+_AI_SEM: asyncio.Semaphore | None = None
+
+# AI result writes are coalesced: the loop's writer drains up to _AI_WRITE_BATCH
+# updates (or whatever arrived within _AI_WRITE_FLUSH_SECONDS) into one bulk_write.
+_AI_WRITE_BATCH = 100
+_AI_WRITE_FLUSH_SECONDS = 0.05
+# Bounded so a stalled Mongo applies backpressure to enrichment instead of piling up results
+_AI_WRITE_QUEUE_MAX = 1000
+_AI_WRITE_QUEUE: asyncio.Queue | None = None
+
+
+def _get_ai_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared AI loop, starting its thread on first use in this process."""
+    global _AI_LOOP, _AI_LOOP_PID, _AI_EXECUTOR, _AI_SEM, _AI_WRITE_QUEUE
+    with _AI_LOOP_LOCK:
+        if _AI_LOOP is None or _AI_LOOP_PID != os.getpid() or _AI_LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='goal-ai-loop', daemon=True).start()
+            _AI_LOOP = loop
+            _AI_LOOP_PID = os.getpid()
+            # Bounds concurrent AI calls so bursts don't swamp the AI engine / Mongo pool
+            _AI_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_AI_MAX_CONCURRENCY, thread_name_prefix='goal-ai'
+            )
+            _AI_SEM = asyncio.Semaphore(_AI_MAX_CONCURRENCY)
+            _AI_WRITE_QUEUE = asyncio.Queue(maxsize=_AI_WRITE_QUEUE_MAX)
+            asyncio.run_coroutine_threadsafe(_ai_write_consumer(_AI_WRITE_QUEUE), loop)
+        return _AI_LOOP
+
+
+async def _ai_write_consumer(queue: asyncio.Queue) -> None:
+    """Drain queued (db, UpdateOne) pairs into batched bulk_write calls, forever."""
+    while True:
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + _AI_WRITE_FLUSH_SECONDS
+        while len(batch) < _AI_WRITE_BATCH:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Group by database handle; normally there is a single one
+        by_db: Dict[int, tuple[Any, List[UpdateOne]]] = {}
+        for db, op in batch:
+            by_db.setdefault(id(db), (db, []))[1].append(op)
+        for db, ops in by_db.values():
+            try:
+                await asyncio.to_thread(db.goals.bulk_write, ops, ordered=False)
+            except Exception:
+                logger.exception('Batched AI goal update failed (%d ops)', len(ops))
+
+
+async def _run_bounded(sem: asyncio.Semaphore, coro):
+    """Await coro once a slot of sem is free."""
+    async with sem:
+        return await coro
+
+
+async def _run_ai_blocking(fn, *args):
+    """Run a blocking call on the AI worker pool (the default pool off the shared loop)."""
+    loop = asyncio.get_running_loop()
+    executor = _AI_EXECUTOR if loop is _AI_LOOP else None
+    return await loop.run_in_executor(executor, fn, *args)
+
+
+async def _queue_ai_update(db, op: UpdateOne) -> None:
+    """Queue an AI result write for the batched writer, or write directly off the shared loop."""
+    if _AI_WRITE_QUEUE is not None and asyncio.get_running_loop() is _AI_LOOP:
+        await _AI_WRITE_QUEUE.put((db, op))
+    else:
+        await asyncio.to_thread(db.goals.bulk_write, [op], ordered=False)
+
 
 # --- Pydantic Data Models for Goal ---
 
+# Cached target_date parsers: background jobs/imports re-validate the same strings
+# repeatedly. Results are immutable datetimes, so sharing them is safe.
+@lru_cache(maxsize=4096)
+def _cached_date_only(raw: str) -> datetime:
+    # Common YYYY-MM-DD shape goes straight to the C-accelerated fromisoformat
+    if len(raw) == 10 and raw[4] == '-' and raw[7] == '-':
+        try:
+            return datetime.fromisoformat(raw).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return parse_date_only(raw)
+
+
+@lru_cache(maxsize=4096)
+def _cached_dt_any(raw: str) -> datetime:
+    return parse_datetime_any(raw)
+
+
 # TargetDate validator mixin (no fields)
 class TargetDateUtcMixin:
     # Pre-parse strings into aware datetimes
@@ -32,8 +206,8 @@ class TargetDateUtcMixin:
             # Heuristic: date-only if length <= 10 (YYYY-MM-DD or similar)
             try:
                 if len(raw) <= 10:
-                    return parse_date_only(raw)
-                return parse_datetime_any(raw)
+                    return _cached_date_only(raw)
+                return _cached_dt_any(raw)
             except Exception as e:  # pragma: no cover - defensive
                 raise ValueError(f"Invalid target_date format: {raw}") from e
         return v
@@ -42,6 +216,42 @@ class TargetDateUtcMixin:
     def _ensure_target_date_utc(cls, v):  # type: ignore[override]
         return ensure_utc(v) if v is not None else None
 
+_HEX24 = re.compile(r'[0-9a-fA-F]{24}').fullmatch
+
+
+def _oid_to_str(v: Any) -> str:
+    """Normalize MongoDB ObjectId (or hex string) to string and validate format."""
+    if isinstance(v, ObjectId):
+        return str(v)
+    # Already-stringified ids (API payloads, cached rows) skip the ObjectId round-trip
+    if type(v) is str and _HEX24(v):
+        return v
+    if not ObjectId.is_valid(v):
+        raise ValueError("Invalid ObjectId")
+    return str(v)
+
+
+# Field-level id type so the conversion runs as a plain function validator
+ObjectIdStr = Annotated[str, BeforeValidator(_oid_to_str)]
+
+
+# ai_plan is stored zlib-compressed (BSON binary) to keep goal documents and the
+# WiredTiger cache small; legacy rows hold plain text. Same field name, so
+# existence checks, projections and $unset keep working unchanged.
+_AI_PLAN_ZLIB_LEVEL = 6
+
+
+def _compress_ai_plan(text: str) -> bytes:
+    return zlib.compress(text.encode('utf-8'), _AI_PLAN_ZLIB_LEVEL)
+
+
+def decode_ai_plan(value: Any) -> Optional[str]:
+    """Return the ai_plan text for a stored value (compressed bytes or legacy str)."""
+    if isinstance(value, (bytes, bytearray)):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
 class GoalBase(TargetDateUtcMixin, BaseModel):
     """Base Goal schema shared by create/store/read variants.
 
@@ -69,6 +279,13 @@ class GoalBase(TargetDateUtcMixin, BaseModel):
     created_at: datetime = Field(default_factory=now_utc)
     last_updated: datetime = Field(default_factory=now_utc)
 
+    model_config = {'extra': 'ignore', 'validate_assignment': False, 'populate_by_name': True}
+
+    @field_validator('currency', mode='after')
+    def _upper_currency(cls, v):  # type: ignore[override]
+        # Normalize once at load so downstream FX lookups skip per-call .upper()
+        return v.upper() if v else v
+
 class GoalCreate(GoalBase):
     """Payload schema for creating a new Goal. Inherits default values from GoalBase."""
     pass
@@ -99,10 +316,10 @@ class GoalInDB(GoalBase):
     - ai_priority/ai_metadata/ai_plan are optional AI-enrichment fields.
     - completed_date is stored for completed goals.
     """
-    id: str = Field(..., alias="_id")
+    id: ObjectIdStr = Field(..., alias="_id")
     # AI metrics below are stored on a 0–100 scale (percent-like)
     ai_priority: Optional[float] = None
-    ai_plan: Optional[str] = None
+    ai_plan: Annotated[Optional[str], BeforeValidator(decode_ai_plan)] = None
     ai_plan_paste_url: Optional[str] = None  # Remote offloaded plan
     ai_plan_offloaded: Optional[bool] = None
     ai_plan_archived_at: Optional[datetime] = None
@@ -115,18 +332,175 @@ class GoalInDB(GoalBase):
 
     completed_date: Optional[datetime] = None
 
-    # Convert incoming Mongo ObjectId (or string) to a string early so core validation passes
-    @field_validator('id', mode='before')
-    def validate_id(cls, v):
-        """Normalize MongoDB ObjectId to string and validate format."""
-        if isinstance(v, ObjectId):
-            return str(v)
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return str(v)
 
+# Goal listing sort modes -> Mongo sort specs. Built once at import; keys are lower-case.
+# Immutable tuples: pymongo accepts them as-is and shared constants cannot be mutated.
+_SortSpec = tuple[tuple[str, int], ...]
+_SORT_MAP: Dict[str, _SortSpec] = {
+    'created_desc': (('created_at', -1),),
+    'created_asc': (('created_at', 1),),
+    'target_date': (('target_date', 1), ('created_at', -1)),
+    'target_date_desc': (('target_date', -1), ('created_at', -1)),
+    'priority': (('ai_priority', -1), ('target_date', 1), ('created_at', -1)),
+}
+# Same modes with completed goals last, for listings that include completed goals
+_SORT_MAP_COMPLETED_LAST: Dict[str, _SortSpec] = {
+    k: (('is_completed', 1),) + v for k, v in _SORT_MAP.items()
+}
+# Index names (see utils/db_indexes.py) whose (user_id, is_completed, ...) key order serves
+# each sort mode, for both the completed-last and active-only listings: no in-memory SORT.
+_SORT_HINTS: Dict[str, str] = {
+    'created_desc': 'user_active_created',
+    'created_asc': 'user_active_created_asc',
+    'target_date': 'user_active_target_date',
+    'target_date_desc': 'user_active_target_date_desc',
+    'priority': 'user_active_priority',
+}
+
+_SECONDS_PER_AVG_MONTH = 30.4375 * 86400
+
+# Cursor batch size for small, projected goal documents (fewer getMore round-trips)
+_SMALL_DOC_BATCH_SIZE = 500
+# ...and for large-document scans (offload reads full ai_plan blobs)
+_LARGE_DOC_BATCH_SIZE = 50
+
+# Only the scalars compute_allocations reads; keeps BSON decode cost off unused fields
+_ALLOC_PROJECTION: Dict[str, int] = {
+    '_id': 1,
+    'target_amount': 1,
+    'currency': 1,
+    'target_date': 1,
+    'created_at': 1,
+    'ai_priority': 1,
+    'ai_urgency': 1,
+    'ai_impact': 1,
+    'ai_health_impact': 1,
+    'ai_confidence': 1,
+}
+
+# Listing endpoints: every GoalInDB field except the large ai_plan text. A positive
+# projection also keeps unknown/legacy fields off the wire.
+_LIST_PROJECTION: Dict[str, int] = {
+    'user_id': 1,
+    'type': 1,
+    'target_amount': 1,
+    'currency': 1,
+    'description': 1,
+    'target_date': 1,
+    'current_amount': 1,
+    'is_completed': 1,
+    'created_at': 1,
+    'last_updated': 1,
+    'completed_date': 1,
+    'ai_priority': 1,
+    'ai_urgency': 1,
+    'ai_impact': 1,
+    'ai_health_impact': 1,
+    'ai_confidence': 1,
+    'ai_summary': 1,
+    'ai_suggestions': 1,
+    'ai_plan_paste_url': 1,
+    'ai_plan_offloaded': 1,
+    'ai_plan_archived_at': 1,
+}
+
+# get_prioritized output skips the large text fields
+_PRIORITIZED_PROJECTION: Dict[str, int] = {'ai_plan': 0, 'ai_summary': 0, 'ai_suggestions': 0}
+_PRIORITIZED_SORT: _SortSpec = (('is_completed', 1), ('ai_priority', -1), ('created_at', -1))
+
+# Built once at import; reusing the adapter avoids per-call kwargs dispatch through GoalInDB.__init__
+_GOAL_ADAPTER: TypeAdapter[GoalInDB] = TypeAdapter(GoalInDB)
+
+
+class GoalRow(TypedDict, total=False):
+    """Lightweight read shape for goal documents coming straight from Mongo.
+
+    Read-only paths (listings, sorting) use this instead of GoalInDB to skip
+    per-document Pydantic validation; GoalInDB stays at the API boundaries.
+    """
+    _id: str
+    user_id: str
+    type: str
+    target_amount: float
+    currency: str
+    description: str
+    target_date: datetime
+    current_amount: float
+    is_completed: bool
+    created_at: datetime
+    last_updated: datetime
+    ai_priority: Optional[float]
+    ai_urgency: Optional[float]
+    ai_impact: Optional[float]
+    ai_health_impact: Optional[float]
+    ai_confidence: Optional[float]
+    ai_suggestions: Optional[List[str]]
+    ai_summary: Optional[str]
+    ai_plan_paste_url: Optional[str]
+    completed_date: Optional[datetime]
+
+
+def _goal_row(doc: Dict[str, Any]) -> GoalRow:
+    """Normalize a raw Mongo goal document in place (ObjectId -> str) without validation."""
+    doc['_id'] = str(doc['_id'])
+    return doc  # type: ignore[return-value]
+
+
+_GOAL_DATETIME_FIELDS = ('target_date', 'created_at', 'last_updated', 'completed_date', 'ai_plan_archived_at')
+
+
+def _normalize_goal_dict(doc: Dict[str, Any]) -> GoalRow:
+    """_goal_row plus UTC-aware datetimes, for read-only rows returned to API callers."""
+    row = _goal_row(doc)
+    for k in _GOAL_DATETIME_FIELDS:
+        v = doc.get(k)
+        if v is not None:
+            doc[k] = ensure_utc(v)
+    return row
+
+
+# Fields without defaults; a row missing any of them must go through validation
+_GOAL_REQUIRED_FIELDS = ('user_id', 'type', 'target_amount', 'currency', 'description', 'target_date')
 
 
+def _construct_goal(doc: Dict[str, Any]) -> GoalInDB:
+    """Build a GoalInDB from a trusted goal document (DB read), skipping re-validation.
+
+    Rows missing required fields, or whose datetime fields are not datetimes
+    (e.g. legacy string target_date), go through full validation instead.
+    """
+    for k in _GOAL_REQUIRED_FIELDS:
+        if k not in doc:
+            return _GOAL_ADAPTER.validate_python(doc)
+    for k in _GOAL_DATETIME_FIELDS:
+        v = doc.get(k)
+        if v is not None and not isinstance(v, datetime):
+            return _GOAL_ADAPTER.validate_python(doc)
+    if 'ai_plan' in doc:
+        doc['ai_plan'] = decode_ai_plan(doc['ai_plan'])
+    # Mirror GoalBase._upper_currency, which model_construct skips
+    ccy = doc.get('currency')
+    if ccy:
+        doc['currency'] = ccy.upper()
+    return GoalInDB.model_construct(**_normalize_goal_dict(doc))
+
+
+def _pct01(val: Optional[float], default: float = 0.0) -> float:
+    """Normalize a stored 0..100 AI signal to 0..1 (default when missing/invalid)."""
+    try:
+        if val is None:
+            return max(0.0, min(1.0, default))
+        return max(0.0, min(1.0, float(val) / 100.0))
+    except Exception:
+        return max(0.0, min(1.0, default))
+
+
+def _goal_field(g: Union[GoalInDB, GoalRow, Dict[str, Any]], name: str, default: Any = None) -> Any:
+    """Read a field from either a GoalInDB or a raw goal row ('id' maps to '_id' on rows)."""
+    if isinstance(g, dict):
+        return g.get('_id' if name == 'id' else name, default)
+    return getattr(g, name, default)
+
 
 class Goal:
     """Storage and domain utilities for Goal records.
@@ -148,14 +522,16 @@ class Goal:
         """
         goal_dict = goal_data.model_dump()
         result = db.goals.insert_one(goal_dict)
-        return GoalInDB(**{**goal_dict, "_id": str(result.inserted_id)})
+        # Fields were validated by GoalCreate; only the generated id is new
+        goal_dict["_id"] = str(result.inserted_id)
+        return GoalInDB.model_construct(**goal_dict)
 
     @staticmethod
-    def get_by_id(goal_id: str, user_id: str, db) -> Optional[GoalInDB]:
+    def get_by_id(goal_id: Union[str, ObjectId], user_id: str, db) -> Optional[GoalInDB]:
         """Fetch a goal by id scoped to a user.
 
         Args:
-            goal_id: String representation of ObjectId.
+            goal_id: ObjectId or its string representation.
             user_id: Owner user id.
             db: Database handle.
 
@@ -165,17 +541,30 @@ class Goal:
         Raises:
             bson.errors.InvalidId: If goal_id is not a valid ObjectId.
         """
-        goal = db.goals.find_one({"_id": ObjectId(goal_id), "user_id": user_id})
-        return GoalInDB(**goal) if goal else None
+        goal = db.goals.find_one({"_id": _oid(goal_id), "user_id": user_id})
+        return _construct_goal(goal) if goal else None
+
+    @staticmethod
+    def get_by_ids(goal_ids: List[Union[str, ObjectId]], user_id: str, db) -> List[GoalInDB]:
+        """Fetch several goals of a user in one query.
+
+        Invalid ids are skipped; missing goals are simply absent from the result.
+        Order follows Mongo's natural order, not the order of goal_ids.
+        """
+        oids = [_oid(i) for i in dict.fromkeys(goal_ids) if isinstance(i, ObjectId) or ObjectId.is_valid(i)]
+        if not oids:
+            return []
+        cursor = db.goals.find({"_id": {"$in": oids}, "user_id": user_id})
+        return [_construct_goal(g) for g in cursor]
 
     @staticmethod
-    def update(goal_id: str, user_id: str, update_data: GoalUpdate, db) -> Optional[GoalInDB]:
+    def update(goal_id: Union[str, ObjectId], user_id: str, update_data: GoalUpdate, db) -> Optional[GoalInDB]:
         """Apply a partial update to a goal and return the updated document.
 
         Only non-null fields in update_data are applied. Also updates last_updated.
 
         Args:
-            goal_id: String ObjectId for the goal.
+            goal_id: ObjectId (or string form) for the goal.
             user_id: Owner user id.
             update_data: Patch payload.
             db: Database handle.
@@ -186,20 +575,20 @@ class Goal:
         Raises:
             bson.errors.InvalidId: If goal_id is not a valid ObjectId.
         """
-        update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
+        update_dict = update_data.model_dump(exclude_none=True)
         if not update_dict:
             return None
 
         update_dict["last_updated"] = now_utc()
         result = db.goals.find_one_and_update(
-            {"_id": ObjectId(goal_id), "user_id": user_id},
+            {"_id": _oid(goal_id), "user_id": user_id},
             {"$set": update_dict},
             return_document=ReturnDocument.AFTER
         )
-        return GoalInDB(**result) if result else None
+        return _construct_goal(result) if result else None
 
     @staticmethod
-    def delete(goal_id: str, user_id: str, db) -> bool:
+    def delete(goal_id: Union[str, ObjectId], user_id: str, db) -> bool:
         """Delete a goal by id for a user.
 
         Returns:
@@ -208,7 +597,7 @@ class Goal:
         Raises:
             bson.errors.InvalidId: If goal_id is not a valid ObjectId.
         """
-        result = db.goals.delete_one({"_id": ObjectId(goal_id), "user_id": user_id})
+        result = db.goals.delete_one({"_id": _oid(goal_id), "user_id": user_id})
         return result.deleted_count > 0
 
     @staticmethod
@@ -242,34 +631,26 @@ class Goal:
         # Priority: explicit param `sort_mode`, then per-user `sort_modes.goals` via User.get_sorting, then default
         if sort_mode is None:
             try:
-                user_obj = User.get_by_id(user_id, db)
-                sort_mode = user_obj.get_sort_mode('goals') if user_obj else None
+                sort_mode = User.get_list_sort_mode(user_id, 'goals', db)
             except Exception:
                 sort_mode = None
-        if not sort_mode:
-            sort_mode = 'created_desc'
-        sort_map: dict[str, list[tuple[str, int]]] = {
-            'created_desc': [('created_at', -1)],
-            'created_asc': [('created_at', 1)],
-            'target_date': [('target_date', 1), ('created_at', -1)],
-            'target_date_desc': [('target_date', -1), ('created_at', -1)],
-            'priority': [('ai_priority', -1), ('target_date', 1), ('created_at', -1)],
-        }
-        mongo_sort = sort_map.get((sort_mode or 'created_desc').lower(), sort_map['created_desc'])
+        mode = sort_mode.lower() if sort_mode else 'created_desc'
+        if mode not in _SORT_MAP:
+            mode = 'created_desc'
+        # Completed goals sort last (is_completed ascending is pre-pended in the constant)
+        mongo_sort = _SORT_MAP_COMPLETED_LAST[mode]
 
-        # Ensure completed goals sort last by prepending is_completed ascending
-        mongo_sort = [('is_completed', 1)] + mongo_sort
-
-        # Default projection excludes large `ai_plan` field unless caller provided a projection
+        # Default projection skips the large `ai_plan` field unless caller provided a projection
         if projection is None:
-            projection = {'ai_plan': 0}
+            projection = _LIST_PROJECTION
         cursor = db.goals.find({"user_id": user_id}, projection).sort(mongo_sort).skip(skip).limit(limit)
         if isinstance(batch_size, int) and batch_size > 0:
             try:
                 cursor = cursor.batch_size(int(batch_size))
             except Exception:
                 pass
-        return [GoalInDB(**g) for g in cursor]
+        hint = _SORT_HINTS[mode] if Config.MONGO_QUERY_HINTS else None
+        return [_construct_goal(g) for g in list_with_hint(cursor, hint)]
 
     @staticmethod
     def get_active_goals(user_id: str, db, skip: int = 0, N: int = -1, batch_size: int = -1, sort_mode: str | None = None, projection: Dict[str, int] | None = None) -> List[GoalInDB]:
@@ -279,27 +660,22 @@ class Goal:
         the user has a persisted preference. This keeps active-goals ordering
         consistent with the goals page and API endpoints.
         """
-        sort_map: dict[str, list[tuple[str, int]]] = {
-            'created_desc': [('created_at', -1)],
-            'created_asc': [('created_at', 1)],
-            'target_date': [('target_date', 1), ('created_at', -1)],
-            'target_date_desc': [('target_date', -1), ('created_at', -1)],
-            'priority': [('ai_priority', -1), ('target_date', 1), ('created_at', -1)],
-        }
         # Resolve sort_mode: prefer explicit param, then per-user `sort_modes.goals` via User.get_sorting, then default
         if not sort_mode:
             try:
-                user_obj = User.get_by_id(user_id, db)
-                sort_mode = user_obj.get_sort_mode('goals') if user_obj else None
+                sort_mode = User.get_list_sort_mode(user_id, 'goals', db)
             except Exception:
                 sort_mode = None
         # Default to same page-style default (newest first) when no explicit/user preference
         # Use the same default as full goals listing for consistency
-        mongo_sort = sort_map.get((sort_mode or 'created_desc').lower(), sort_map['created_desc'])
+        mode = sort_mode.lower() if sort_mode else 'created_desc'
+        if mode not in _SORT_MAP:
+            mode = 'created_desc'
+        mongo_sort = _SORT_MAP[mode]
 
-        # Default projection excludes large `ai_plan` field unless caller provided a projection
+        # Default projection skips the large `ai_plan` field unless caller provided a projection
         if projection is None:
-            projection = {'ai_plan': 0}
+            projection = _LIST_PROJECTION
         cursor = db.goals.find({"user_id": user_id, "is_completed": False}, projection).sort(mongo_sort)
         if isinstance(batch_size, int) and batch_size > 0:
             try:
@@ -310,10 +686,11 @@ class Goal:
             cursor = cursor.skip(skip)
         if N > 0:
             cursor = cursor.limit(N)
-        return [GoalInDB(**g) for g in cursor]
+        hint = _SORT_HINTS[mode] if Config.MONGO_QUERY_HINTS else None
+        return [_construct_goal(g) for g in list_with_hint(cursor, hint)]
 
     @staticmethod
-    def calculate_goal_progress(goal: GoalInDB, monthly_summary: Dict[str, Any], override_current_amount: float | None = None, base_currency_code: str = 'USD') -> Dict[str, Any]:
+    def calculate_goal_progress(goal: GoalInDB, monthly_summary: Dict[str, Any], override_current_amount: float | None = None, base_currency_code: str = 'USD', now: datetime | None = None, rates: Dict[tuple[str, str], float] | None = None, rate_base_to_goal: float | None = None) -> Dict[str, Any]:
         """Compute progress and projections for a goal.
 
         Behavior:
@@ -328,24 +705,45 @@ class Goal:
             monthly_summary: Dict with monthly aggregates (expects 'savings' in base currency).
             override_current_amount: Optional override for current amount (in base currency).
             base_currency_code: User base currency for conversions.
+            now: Optional reference time; callers looping over many goals pass one
+                value so now_utc() is not re-read per goal.
+            rates: Optional request-scoped memo of (base_currency_code, goal_currency) -> rate.
+                Missing pairs are looked up once and stored; callers looping over goals
+                pass the same dict (an empty one is fine).
+            rate_base_to_goal: Optional precomputed base -> goal currency rate; takes
+                precedence over `rates` when the caller already knows it.
 
         Returns:
             Dict including current_amount, target_amount, progress_percent, remaining_days,
             remaining_months, and for savings goals also required_monthly, current_monthly, currency.
         """
-        target_date = ensure_utc(goal.target_date)
-        now = now_utc()
-        delta_sec = (target_date - now).total_seconds()
+        if now is None:
+            now = now_utc()
+        delta_sec = ensure_utc(goal.target_date).timestamp() - now.timestamp()
         remaining_days = int(delta_sec // 86400)  # keep sign (negative when past due)
-        remaining_months = delta_sec / (30 * 86400)
+        # Average Gregorian month (365.25 / 12 days) rather than a flat 30 days
+        remaining_months = delta_sec / _SECONDS_PER_AVG_MONTH
 
         # Normalize currencies
         goal_currency = goal.currency
-        from utils.currency import currency_service
+        if rate_base_to_goal is not None or rates is not None:
+            rate = rate_base_to_goal
+            if rate is None:
+                pair = (base_currency_code, goal_currency)
+                rate = rates.get(pair)
+                if rate is None:
+                    rate = rates[pair] = currency_service.get_rate(base_currency_code, goal_currency)
+
+            def _convert(amount: float) -> float:
+                # Same 2-decimal rounding as currency_service.convert_amount
+                return round(amount * rate, 2)
+        else:
+            def _convert(amount: float) -> float:
+                return currency_service.convert_amount(amount, base_currency_code, goal_currency)
 
         # Determine current amount in goal currency
         if override_current_amount is not None:
-            current_amt_goal = currency_service.convert_amount(float(override_current_amount), base_currency_code, goal_currency)
+            current_amt_goal = _convert(float(override_current_amount))
         else:
             current_amt_goal = float(goal.current_amount or 0.0)
 
@@ -363,13 +761,33 @@ class Goal:
             )
             monthly_savings_base = float(monthly_summary.get("savings", 0) or 0)
             # Convert monthly savings (base currency) into goal currency
-            progress_data["current_monthly"] = currency_service.convert_amount(monthly_savings_base, base_currency_code, goal_currency)
+            progress_data["current_monthly"] = _convert(monthly_savings_base)
             progress_data["currency"] = goal_currency
 
         return progress_data
 
     @staticmethod
-    def compute_allocations(user_id: str, db, *, sort_by: str = 'algorithmic', cache_id: str | None = None, goals_list: List[GoalInDB] | None = None) -> Dict[str, float]:
+    def calculate_many_progress(goals: List[GoalInDB], monthly_summary: Dict[str, Any], base_currency_code: str = 'USD', overrides: Dict[str, float] | None = None, rates: Dict[tuple[str, str], float] | None = None, now: datetime | None = None) -> List[Dict[str, Any]]:
+        """calculate_goal_progress over a page of goals, in input order.
+
+        Reads the clock once and shares one FX rate memo across the batch.
+        overrides maps goal id -> current amount in base currency (e.g. allocations).
+        """
+        if now is None:
+            now = now_utc()
+        if rates is None:
+            rates = {}
+        overrides = overrides or {}
+        return [
+            Goal.calculate_goal_progress(
+                g, monthly_summary, override_current_amount=overrides.get(g.id),
+                base_currency_code=base_currency_code, now=now, rates=rates,
+            )
+            for g in goals
+        ]
+
+    @staticmethod
+    def compute_allocations(user_id: str, db, *, sort_by: str = 'algorithmic', cache_id: str | None = None, goals_list: List[Union[GoalInDB, GoalRow]] | None = None) -> Dict[str, float]:
         """Allocate lifetime current balance across active goals (FIFO-style).
 
         Algorithm:
@@ -398,105 +816,143 @@ class Goal:
         # Get lifetime current balance as savings pool
         lifetime = calculate_lifetime_transaction_summary(user_id, db, cache_id=cache_id)
         pool = max(float(lifetime.get('current_balance', 0) or 0), 0.0)
-        # Determine user's base currency for conversions
-        user_doc = db.users.find_one({'_id': ObjectId(user_id)})
-        base_ccy = (user_doc or {}).get('default_currency', 'USD').upper()
-
-        # Fetch active goals (exclude large ai_plan field for performance) unless provided by caller
+        # Determine user's base currency for conversions and, unless provided by the
+        # caller, fetch active goals (projected to the scoring fields) in the same
+        # round-trip via $lookup. Self-fetched goals stay raw rows: the sort only reads
+        # a handful of scalars, so Pydantic validation would be pure overhead here.
+        server_sorted = goals_list is None and sort_by != 'algorithmic'
         if goals_list is None:
-            goals_cursor = db.goals.find({"user_id": user_id, "is_completed": False}, {"ai_plan": 0})
-            # Sort in Python to avoid index requirements
-            goals_list = [GoalInDB(**g) for g in goals_cursor]
+            projection = _ALLOC_PROJECTION
+            goal_stages: List[Dict[str, Any]] = [{'$match': {'user_id': user_id, 'is_completed': False}}]
+            if server_sorted:
+                projection = {**projection, sort_by: 1}
+                # Field sorts run in Mongo: missing/null sort_by falls back to created_at
+                # (the sort_by='created_at' case walks the user_active_created index)
+                goal_stages += [
+                    {'$addFields': {'_sort_key': {'$ifNull': [f'${sort_by}', '$created_at']}}},
+                    {'$sort': {'_sort_key': 1, '_id': 1}},
+                ]
+            goal_stages.append({'$project': projection})
+            pipeline = [
+                {'$match': {'_id': _oid(user_id)}},
+                {'$project': {'default_currency': 1}},
+                {'$lookup': {
+                    'from': 'goals',
+                    'pipeline': goal_stages,
+                    'as': 'goals',
+                }},
+            ]
+            rows = list(db.users.aggregate(pipeline))
+            user_doc = rows[0] if rows else None
+            if user_doc is not None:
+                raw_goals = user_doc.pop('goals', None) or []
+            else:
+                # No user document: still allocate over whatever goals exist
+                raw_goals = db.goals.aggregate(goal_stages, batchSize=_SMALL_DOC_BATCH_SIZE)
+            goals_list = [_goal_row(g) for g in raw_goals]
+        else:
+            user_doc = User.get_list_prefs(user_id, db)
+        base_ccy = (user_doc or {}).get('default_currency', 'USD').upper()
 
         # IMPORTANT: Never mutate caller-provided list order (it's the response order)
-        working_list: List[GoalInDB] = list(goals_list)
+        working_list: List[Union[GoalInDB, GoalRow]] = list(goals_list)
+
+        # Empty pool: every goal gets 0.0, so skip FX, scoring and sorting entirely
+        if int(round(pool * 100)) <= 0:
+            return {str(_goal_field(g, 'id')): 0.0 for g in working_list}
+
+        # One FX rate table for all distinct goal currencies, then each goal's target is
+        # converted exactly once; the sort and the FIFO fill both read these lists.
+        n = len(working_list)
+        target = [float(_goal_field(g, 'target_amount') or 0.0) for g in working_list]
+        ccys = [(_goal_field(g, 'currency') or base_ccy).upper() for g in working_list]
+        distinct_ccys = set(ccys)
+        # Common case: every goal already in the base currency, no FX lookup needed
+        rates = {base_ccy: 1.0} if distinct_ccys == {base_ccy} else currency_service.get_rates_to(base_ccy, distinct_ccys)
+        # Same 2-decimal rounding as currency_service.convert_amount
+        target_in_base = [round(t * rates[c], 2) for t, c in zip(target, ccys)]
 
         if sort_by == 'algorithmic':
-            def _algorithmic_sort_key(goalindb: GoalInDB):
-                # Time metrics
-                target_dt = ensure_utc(goalindb.target_date) if goalindb.target_date else now_utc()
-                _now = now_utc()
-                days_left = max(int((target_dt - _now).total_seconds() // 86400), -3650)
-
-                # Monetary normalization
-                target_in_base = currency_service.convert_amount(
-                    float(goalindb.target_amount or 0.0),
-                    (goalindb.currency or base_ccy).upper(),
-                    base_ccy,
-                )
-
-                # Normalize AI signals to 0..1 from stored 0..100
-                def _pct01(val: Optional[float], default: float = 0.0) -> float:
-                    try:
-                        if val is None:
-                            return max(0.0, min(1.0, default))
-                        return max(0.0, min(1.0, float(val) / 100.0))
-                    except Exception:
-                        return max(0.0, min(1.0, default))
-
-                priority_n = _pct01(goalindb.ai_priority, 0.5)
-                urgency_n = _pct01(goalindb.ai_urgency, 0.0)
-                impact_n = _pct01(goalindb.ai_impact, 0.0)
-                health_n = _pct01(goalindb.ai_health_impact, 0.0)
-                confidence = _pct01(goalindb.ai_confidence, 0.5)
-
-                # If AI urgency missing, infer a soft urgency from time left (sooner => higher)
-                if goalindb.ai_urgency is None:
-                    # 0 when > 24 months away, 100 when due now or overdue
-                    inferred_urgency_pct = max(0.0, min(100.0, 100.0 * (1.0 - (days_left / (24 * 30)))))
-                    urgency_n = inferred_urgency_pct / 100.0
-
+            # Struct-of-arrays pass: read every scalar the score needs once per goal,
+            # then score in flat loops and sort an index list once.
+            # `now` is read once; target dates become epoch seconds up front so
+            # days_left is plain float math instead of datetime/timedelta churn.
+            _now = now_utc()
+            now_ts = _now.timestamp()
+            target_ts = [
+                ensure_utc(td).timestamp() if td else now_ts
+                for td in (_goal_field(g, 'target_date') for g in working_list)
+            ]
+            days_left = [max(int((ts - now_ts) // 86400), -3650) for ts in target_ts]
+            ai_urgency = [_goal_field(g, 'ai_urgency') for g in working_list]
+            priority_n = [_pct01(_goal_field(g, 'ai_priority'), 0.5) for g in working_list]
+            # If AI urgency missing, infer a soft urgency from time left (sooner => higher):
+            # 0 when > 24 months away, 1 when due now or overdue
+            urgency_n = [
+                _pct01(u, 0.0) if u is not None else max(0.0, min(1.0, 1.0 - (d / (24 * 30))))
+                for u, d in zip(ai_urgency, days_left)
+            ]
+            impact_n = [_pct01(_goal_field(g, 'ai_impact'), 0.0) for g in working_list]
+            health_n = [_pct01(_goal_field(g, 'ai_health_impact'), 0.0) for g in working_list]
+            confidence = [_pct01(_goal_field(g, 'ai_confidence'), 0.5) for g in working_list]
+            created = [_goal_field(g, 'created_at') or _now for g in working_list]
+
+            penalty_weight = 0.15  # keep conservative to avoid overwhelming AI score
+            value = [0.0] * n
+            for i in range(n):
+                d = days_left[i]
+                t_base = target_in_base[i]
                 # Time-pressure penalty (dimensionless, scaled to pool)
                 # - time_pressure: 1.0 when due/overdue, scales down with more days (<=30 days -> near 1)
                 # - resource_ratio: how large the target is vs available pool (capped to avoid overpower)
-                penalty_weight = 0.15  # keep conservative to avoid overwhelming AI score
-                time_pressure = 1.0 if days_left <= 0 else min(1.0, 30.0 / max(days_left, 1))
-                resource_ratio = 0.0
-                if pool > 0:
-                    resource_ratio = min(1.0, target_in_base / pool)
+                time_pressure = 1.0 if d <= 0 else min(1.0, 30.0 / max(d, 1))
+                resource_ratio = min(1.0, t_base / pool) if pool > 0 else 0.0
                 penalty_amount = penalty_weight * time_pressure * resource_ratio * pool
-
                 # Fraction of goal we could cover from pool right now (bounded)
-                coverage = 0.0
-                if target_in_base > 0:
-                    coverage = max(0.0, min(1.0, pool / target_in_base))
-
+                coverage = max(0.0, min(1.0, pool / t_base)) if t_base > 0 else 0.0
                 # Aggregate AI-driven score; emphasize priority and urgency, keep impact & confidence
                 ai_base = (
-                    0.45 * priority_n +
-                    0.40 * urgency_n +
-                    0.10 * impact_n +
-                    0.05 * health_n
+                    0.45 * priority_n[i] +
+                    0.40 * urgency_n[i] +
+                    0.10 * impact_n[i] +
+                    0.05 * health_n[i]
                 )
-                ai_score = ai_base * confidence
-
+                ai_score = ai_base * confidence[i]
                 # Overall value combines AI score and coverage bonus, minus a bounded time-pressure penalty
-                value = (ai_score * pool) + (0.2 * coverage * pool) - penalty_amount
-
-                # Sort primarily by value desc, then by priority, then earliest due date, then earliest created
-                return (
-                    value,
-                    priority_n,
-                    -days_left,
-                    (goalindb.created_at or _now),
-                )
-
-            working_list.sort(key=_algorithmic_sort_key, reverse=True)
+                value[i] = (ai_score * pool) + (0.2 * coverage * pool) - penalty_amount
+
+            # Sort primarily by value desc, then by priority, then earliest due date, then earliest created
+            # Schwartzian transform: materialize the key tuples once, sort indices by lookup
+            sort_keys = list(zip(value, priority_n, [-d for d in days_left], created))
+            order = sorted(range(n), key=sort_keys.__getitem__, reverse=True)
+        elif server_sorted:
+            order = range(n)
         else:
-            working_list.sort(key=lambda g: getattr(g, sort_by) or getattr(g, 'created_at') or now_utc())
+            fallback_dt = now_utc()
+            order = sorted(range(n), key=lambda i: _goal_field(working_list[i], sort_by) or _goal_field(working_list[i], 'created_at') or fallback_dt)
 
         allocations: Dict[str, float] = {}
-        for g in working_list:
-            gid = str(g.id)
-            target = float(g.target_amount or 0)
-            g_ccy = (g.currency or base_ccy).upper()
-            target_in_base = currency_service.convert_amount(target, g_ccy, base_ccy)
-            if pool <= 0 or target <= 0:
+        # FIFO fill in integer cents: no per-step float rounding
+        pool_cents = int(round(pool * 100))
+        filled = 0
+        for i in order:
+            if pool_cents <= 0:
+                break
+            filled += 1
+            # ObjectId -> str only for the returned keys
+            gid = str(_goal_field(working_list[i], 'id'))
+            if target[i] <= 0:
                 allocations[gid] = 0.0
                 continue
-            amt = min(pool, target_in_base)
-            allocations[gid] = round(amt, 2)
-            pool = round(pool - amt, 2)
+            target_cents = int(round(target_in_base[i] * 100))
+            amt_cents = min(pool_cents, target_cents)
+            allocations[gid] = amt_cents / 100.0
+            pool_cents -= amt_cents
+        # Pool drained: every remaining goal gets an explicit 0.0 (callers treat a
+        # present key as the allocated amount, a missing one as "no allocation data")
+        if filled < n:
+            for i in list(order)[filled:]:
+                allocations[str(_goal_field(working_list[i], 'id'))] = 0.0
 
         return allocations
 
@@ -519,8 +975,7 @@ class Goal:
             db: Database handle.
             ai_engine: AI engine/provider used by helper functions.
         """
-        from models.user import User  # local import to minimize circular refs
-        from utils.ai_helper import run_goal_priority_analysis, get_goal_plan
+        from utils.ai_helper import build_financial_context, run_goal_priority_analysis, get_goal_plan
         try:
             # Normalize goal dict
             if isinstance(goal_data, GoalInDB):
@@ -529,38 +984,32 @@ class Goal:
                 goal_dict = goal_data.copy()
 
             user_id_str = goal_dict['user_id']
-            user = db.users.find_one({'_id': ObjectId(user_id_str)})
-            if not user:
+            user_obj = await _run_ai_blocking(_get_user_snapshot, user_id_str, db)
+            if not user_obj:
                 raise ValueError(f"User with ID {user_id_str} not found")
 
-            user_obj = User(user, db)
-
-            ai_analysis = await run_goal_priority_analysis(user_obj, ai_engine, goal_dict)
-
+            # Both prompts share one financial context (lifetime/period summaries are
+            # the expensive part), built once per enrichment instead of per prompt
+            context = await _run_ai_blocking(build_financial_context, user_obj)
+            # The AI helpers await the engine, which pushes only the synchronous
+            # Gemini SDK call onto a worker thread; they run on this loop directly
+            ai_analysis = await run_goal_priority_analysis(user_obj, ai_engine, goal_dict, context)
 
             # Generate a concrete step-by-step plan using the dedicated helper
             try:
-                plan_text: str = await get_goal_plan(
-                    goal_dict,
-                    user_obj
-                )
+                plan_text: str = await get_goal_plan(goal_dict, user_obj, context)
             except Exception:
-                traceback.print_exc()
+                logger.exception('AI plan generation failed for goal %s', goal_id)
                 plan_text = ai_analysis.get('summary') or 'Plan unavailable.'
 
-            # Compute days_left for fallback urgency/priority
-            target_dt = ensure_utc(goal_dict.get('target_date')) if goal_dict.get('target_date') else now_utc()
-            now = now_utc()
-            days_left = max(int((target_dt - now).total_seconds() // 86400), -3650)
-
             priority_pct = ai_analysis.get('priority_score', 0)
             urgency_pct = ai_analysis.get('urgency', 0)
             impact_pct = ai_analysis.get('financial_impact', 0)
             health_pct = ai_analysis.get('health_impact', 0)
             confidence_pct = ai_analysis.get('confidence', 50)
 
-            db.goals.update_one(
-                {'_id': ObjectId(goal_id)},
+            await _queue_ai_update(db, UpdateOne(
+                {'_id': _oid(goal_id)},
                 {'$set': {
                     'ai_priority': priority_pct,
                     'ai_urgency': urgency_pct,
@@ -570,47 +1019,66 @@ class Goal:
                     'ai_suggestions': ai_analysis.get('suggested_actions'),
                     # Keep the short summary in metadata for context
                     'ai_summary': ai_analysis.get('summary'),
-                    'ai_plan': plan_text,
+                    'ai_plan': _compress_ai_plan(plan_text),
                     'last_updated': now_utc()
                 }}
-            )
-        except Exception as e:
-            # Simple stderr logging; can integrate logger
-            print(f"AI enhancement failed for goal {goal_id}: {e}\n{traceback.format_exc()}")
+            ))
+        except Exception:
+            logger.exception('AI enhancement failed for goal %s', goal_id)
+
+    @staticmethod
+    def schedule_ai_enhance(goal_id: Union[str, ObjectId], goal_data: Union[GoalInDB, Dict[str, Any]], db, ai_engine) -> concurrent.futures.Future:
+        """Submit AI enrichment to the shared background loop and return immediately.
+
+        At most _AI_MAX_CONCURRENCY enrichments run at once; later ones wait on the
+        loop's semaphore.
+        """
+        loop = _get_ai_loop()
+        return asyncio.run_coroutine_threadsafe(
+            _run_bounded(_AI_SEM, Goal._ai_enhance_goal(goal_id, goal_data, db, ai_engine)), loop
+        )
+
+    @staticmethod
+    def get_ai_plan(goal_doc: dict) -> Optional[str]:
+        """Return the locally stored ai_plan text of a raw goal document, if any."""
+        return decode_ai_plan(goal_doc.get('ai_plan'))
+
+    @staticmethod
+    def schedule_remote_plan_delete(goal_doc: dict, pastebin_client=None) -> concurrent.futures.Future:
+        """Submit deletion of an offloaded ai_plan paste to the shared background loop."""
+        return asyncio.run_coroutine_threadsafe(
+            Goal.delete_remote_ai_plan_if_any(goal_doc, pastebin_client), _get_ai_loop()
+        )
 
     @staticmethod
     def enhance_goal_background(goal: GoalInDB, db, ai_engine):
-        """Run AI enrichment in a detached daemon thread for non-blocking UX."""
-        def runner():
-            asyncio.run(Goal._ai_enhance_goal(goal.id, goal, db, ai_engine))
-        threading.Thread(target=runner, daemon=True).start()
+        """Run AI enrichment on the shared background loop for non-blocking UX."""
+        Goal.schedule_ai_enhance(goal.id, goal, db, ai_engine)
 
     @staticmethod
     def get_prioritized(user_id: str, db) -> List[dict]:
-        """Return goals sorted by ai_priority descending (excluding large ai_plan body)."""
-        cursor = db.goals.find({'user_id': user_id}, {'ai_plan': 0})
-        goals_list = [GoalInDB(**g) for g in cursor]
-
-        # sort by ai_priority desc then created_at desc, but always place completed goals at the end
-        def _priority_key(g: GoalInDB):
-            p = getattr(g, 'ai_priority', None)
-            try:
-                p_val = float(p) if p is not None else 0.0
-            except Exception:
-                p_val = 0.0
-            created = getattr(g, 'created_at', now_utc()) or now_utc()
-            # We want primary key: is_completed (False first), then priority desc, then created_at desc
-            return (1 if getattr(g, 'is_completed', False) else 0, -p_val, -created.timestamp())
+        """Return goals sorted by ai_priority descending (excluding large ai_plan/ai_summary/ai_suggestions).
 
-        goals_list.sort(key=_priority_key)
-        return [GoalInDB(**g.model_dump(by_alias=True)).model_dump(by_alias=True) if isinstance(g, GoalInDB) else GoalInDB(**g).model_dump(by_alias=True) for g in goals_list]
+        Each item is GoalInDB.model_dump(by_alias=True), so every field is present;
+        the projected-out text fields come back as None.
+        """
+        # Active goals first, then ai_priority desc, then created_at desc; served by the
+        # user_completed_priority_created index (unscored goals sort after scored ones)
+        cursor = (
+            db.goals.find({'user_id': user_id}, _PRIORITIZED_PROJECTION)
+            .sort(_PRIORITIZED_SORT)
+            .batch_size(_SMALL_DOC_BATCH_SIZE)
+        )
+        # One unvalidated model per stored document instead of parse + re-parse + dump
+        return [_construct_goal(g).model_dump(by_alias=True) for g in cursor]
 
     @staticmethod
-    def mark_as_completed(user_id: str, goal_id: ObjectId, db):
+    def mark_as_completed(user_id: str, goal_id: Union[str, ObjectId], db):
         """Mark a goal as completed, storing completed_date and updating last_updated."""
+        ts = now_utc()
         db.goals.update_one(
-            {'_id': goal_id, 'user_id': user_id},
-            {'$set': {'is_completed': True, 'completed_date': now_utc(), 'last_updated': now_utc()}}
+            {'_id': _oid(goal_id), 'user_id': user_id},
+            {'$set': {'is_completed': True, 'completed_date': ts, 'last_updated': ts}}
         )
 
     # ---------- AI PLAN OFFLOADING (Pastebin) ----------
@@ -635,28 +1103,47 @@ class Goal:
                 {'ai_plan_offloaded': False}
             ],
             'last_updated': {'$lt': cutoff}
-        })
+        }, {'description': 1, 'ai_plan': 1}).batch_size(_LARGE_DOC_BATCH_SIZE)
+        # Pastebin calls are independent I/O; run them concurrently but bounded
+        sem = asyncio.Semaphore(8)
+
+        async def _one(g):
+            async with sem:
+                try:
+                    paste_url = await pastebin_client.create_paste(
+                        title=f"GoalPlan {g.get('description','goal')} {g['_id']}",
+                        content=decode_ai_plan(g.get('ai_plan')) or '',
+                        private=True
+                    )
+                except Exception:
+                    paste_url = None
+            return g, paste_url
+
+        # Pull one cursor batch at a time off the loop so only a chunk of ai_plan
+        # blobs is in memory; paste it concurrently, then write it in one bulk_write
         migrated = 0
-        for g in cursor:
-            try:
-                paste_url = await pastebin_client.create_paste(
-                    title=f"GoalPlan {g.get('description','goal')} {g['_id']}",
-                    content=g.get('ai_plan') or '',
-                    private=True
-                ) if pastebin_client else None
-            except Exception:
-                paste_url = None
-            update_doc = {
-                'ai_plan_offloaded': bool(paste_url),
-                'ai_plan_archived_at': now_utc(),
-                'last_updated': now_utc()
-            }
-            if paste_url:
-                update_doc['ai_plan_paste_url'] = paste_url
-            # Remove local content if successfully offloaded
-            unset = {'ai_plan': ''} if paste_url else {}
-            db.goals.update_one({'_id': g['_id']}, {'$set': update_doc, '$unset': unset})
-            migrated += 1
+        ts = now_utc()
+        while True:
+            chunk = await asyncio.to_thread(list, islice(cursor, _LARGE_DOC_BATCH_SIZE))
+            if not chunk:
+                break
+            results = await asyncio.gather(*[_one(g) for g in chunk])
+            ops: List[UpdateOne] = []
+            for g, paste_url in results:
+                update_doc = {
+                    'ai_plan_offloaded': bool(paste_url),
+                    'ai_plan_archived_at': ts,
+                    'last_updated': ts
+                }
+                update: Dict[str, Any] = {'$set': update_doc}
+                if paste_url:
+                    update_doc['ai_plan_paste_url'] = paste_url
+                    # Remove local content if successfully offloaded
+                    update['$unset'] = {'ai_plan': ''}
+                ops.append(UpdateOne({'_id': g['_id']}, update))
+            # Blocking driver call: keep it off the event loop
+            await asyncio.to_thread(db.goals.bulk_write, ops, ordered=False)
+            migrated += len(ops)
         return migrated
 
     @staticmethod
@@ -675,28 +1162,42 @@ class Goal:
             return False
 
     @staticmethod
-    def compact_dict(goal: GoalInDB|dict, include_ai_analysis=False) -> dict:
-        """Return a compact representation of the goal."""
-        if isinstance(goal, GoalInDB):
-            goal = goal.model_dump(by_alias=True)
+    def compact_dict(goal: GoalInDB|dict, include_ai_analysis=False, now_ts: float | None = None) -> dict:
+        """Return a compact representation of the goal.
 
+        now_ts: optional epoch seconds for "now"; batch callers read the clock once and pass it.
+        """
+        # Read fields directly instead of model_dump()-ing the whole model (incl. ai_plan)
+        if isinstance(goal, GoalInDB):
+            get = lambda k, d=None: getattr(goal, k, d)  # noqa: E731
+        else:
+            get = goal.get
+
+        target_date = get('target_date', '')
+        if now_ts is None:
+            now_ts = now_utc().timestamp()
+        if target_date:
+            # Aware datetimes convert directly; naive ones are UTC by convention
+            td_ts = (target_date if target_date.tzinfo is not None else ensure_utc(target_date)).timestamp()
+        else:
+            td_ts = now_ts
         compact = {
-            'description': goal.get('description', ''),
-            'target_amount': goal.get('target_amount', 0),
-            'target_date': goal.get('target_date', ''),
-            'currency': goal.get('currency', ''),
-            'days_left': max(int(((ensure_utc(goal.get('target_date')) if goal.get('target_date') else now_utc()) - now_utc()).total_seconds() // 86400), -3650),
+            'description': get('description', ''),
+            'target_amount': get('target_amount', 0),
+            'target_date': target_date,
+            'currency': get('currency', ''),
+            'days_left': max(int((td_ts - now_ts) // 86400), -3650),
         }
 
         if include_ai_analysis:
             compact.update({
-                'ai_priority': goal.get('ai_priority'),
-                'ai_urgency': goal.get('ai_urgency'),
-                'ai_impact': goal.get('ai_impact'),
-                'ai_health_impact': goal.get('ai_health_impact'),
-                'ai_confidence': goal.get('ai_confidence'),
-                'ai_summary': goal.get('ai_summary'),
-                'ai_suggestions': goal.get('ai_suggestions'),
+                'ai_priority': get('ai_priority'),
+                'ai_urgency': get('ai_urgency'),
+                'ai_impact': get('ai_impact'),
+                'ai_health_impact': get('ai_health_impact'),
+                'ai_confidence': get('ai_confidence'),
+                'ai_summary': get('ai_summary'),
+                'ai_suggestions': get('ai_suggestions'),
             })
 
         return compact
@@ -712,14 +1213,13 @@ class Goal:
         """
         # Resolve projection
         if projection is None:
-            projection = {'ai_plan': 0}
+            projection = _LIST_PROJECTION
 
         # Resolve sort_mode: prefer explicit, then user's saved preference, then sensible defaults
         resolved_sort = sort_mode
         if not resolved_sort:
             try:
-                user_obj = User.get_by_id(user_id, db)
-                resolved_sort = user_obj.get_sort_mode('goals') if user_obj else None
+                resolved_sort = User.get_list_sort_mode(user_id, 'goals', db)
             except Exception:
                 resolved_sort = None
         if not resolved_sort:
@@ -740,7 +1240,7 @@ class Goal:
             total = db.goals.count_documents({'user_id': user_id, 'is_completed': False})
 
         # Determine user's base currency for conversions
-        user_doc = db.users.find_one({'_id': ObjectId(user_id)})
+        user_doc = User.get_list_prefs(user_id, db)
         user_default_code = (user_doc or {}).get('default_currency', 'USD')
 
         # Compute allocations using the provided goal models to avoid re-querying
@@ -756,9 +1256,9 @@ class Goal:
             }, {'_id': 1}))
 
         items = []
-        for gm in goal_models:
+        progresses = Goal.calculate_many_progress(goal_models, {}, user_default_code, overrides=allocations)
+        for gm, goal_oid, progress in zip(goal_models, page_goal_ids, progresses):
             alloc_amt = allocations.get(gm.id, None)
-            progress = Goal.calculate_goal_progress(gm, {}, override_current_amount=alloc_amt, base_currency_code=user_default_code) if gm else {}
             # Note: callers commonly pass a monthly_summary; when not available here progress may be less detailed.
             gdict = gm.model_dump(by_alias=True)
             td = gdict.get('target_date')
@@ -767,24 +1267,43 @@ class Goal:
             gdict['progress'] = progress
             if alloc_amt is not None:
                 gdict['allocated_amount'] = alloc_amt
-            gdict['has_ai_plan'] = (ObjectId(gm.id) in existing_plan_ids) or bool(gdict.get('ai_plan_paste_url'))
+            gdict['has_ai_plan'] = (goal_oid in existing_plan_ids) or bool(gdict.get('ai_plan_paste_url'))
             items.append(gdict)
 
         return {'items': items, 'total': total, 'page': page, 'per_page': per_page, 'sort': resolved_sort}
 
 
 
-from typing import Dict, Optional
+def _pct_values_getter(names: tuple[str, ...]):
+    """attrgetter that always returns a tuple, even for a single field name."""
+    if len(names) == 1:
+        getter = attrgetter(names[0])
+        return lambda g: (getter(g),)
+    return attrgetter(*names)
+
+
+# Allocator AI signals: (soa key, candidate field names, model getter, default). Only
+# names that GoalInDB declares are kept (legacy aliases never survive extra='ignore'),
+# so each model is read with one attrgetter call instead of hasattr/getattr probes per
+# name; raw rows are read by the same names.
+_ALLOCATOR_PCT_FIELDS = tuple(
+    (key, kept, _pct_values_getter(kept), default)
+    for key, names, default in (
+        ('priority_n', ('ai_priority', 'priority_score'), 0.5),
+        ('urgency_n', ('ai_urgency', 'urgency'), 0.0),
+        ('impact_n', ('ai_impact', 'financial_impact'), 0.0),
+        ('health_n', ('ai_health_impact', 'health_impact'), 0.0),
+        ('confidence', ('ai_confidence', 'confidence'), 0.6),
+    )
+    for kept in (tuple(n for n in names if n in GoalInDB.model_fields),)
+)
+
 
 class Allocator:
     @staticmethod
-    def _safe_pct_field(goal, *names, default=0.0):
-        """
-        Read several possible AI fields and normalize to 0..1 floats.
-        Accepts both 0..100 ints and 0..1 floats (defensive).
-        """
-        for n in names:
-            val = getattr(goal, n, None) if hasattr(goal, n) else goal.get(n) if isinstance(goal, dict) else None
+    def _pct_from_values(values, default=0.0):
+        """Return the first usable value normalized to 0..1 (accepts 0..100 or 0..1 scales)."""
+        for val in values:
             if val is None:
                 continue
             try:
@@ -800,102 +1319,81 @@ class Allocator:
         return max(0.0, min(1.0, float(default)))
 
     @staticmethod
-    def compute_allocations(user_id: str, db, *, sort_by: str = 'algorithmic', cache_id: str | None = None, goals_list: List[GoalInDB] | None = None) -> Dict[str, float]:
-        """Improved allocation algorithm: two-pass (secure urgent needs, then proportional by value).
-        Returns mapping goal_id -> allocation (base currency amount, rounded to 2 decimals).
-        """
-        # --- Gather pool and base currency ---
-        lifetime = calculate_lifetime_transaction_summary(user_id, db, cache_id=cache_id) or {}
-        pool = max(float(lifetime.get('current_balance', 0) or 0), 0.0)
-        if pool == 0:
-            return {}
-
-        user_doc = db.users.find_one({'_id': ObjectId(user_id)})
-        base_ccy = (user_doc or {}).get('default_currency', 'USD').upper()
-
-        # Optional: monthly savings estimate (fallbacks)
-        monthly_savings_est = None
-        # prefer explicit field if available
-        if lifetime.get('monthly_net_savings') is not None:
-            try:
-                monthly_savings_est = float(lifetime.get('monthly_net_savings') or 0.0)
-            except Exception:
-                monthly_savings_est = None
-        # fallback to an approximate (pool/12) if unknown
-        if monthly_savings_est is None or monthly_savings_est <= 0:
-            monthly_savings_est = max(0.0, pool / 12.0)
-
-        # Fetch goals (exclude heavy ai_plan) unless provided by caller
-        if goals_list is None:
-            goals_cursor = db.goals.find({"user_id": user_id, "is_completed": False}, {"ai_plan": 0})
-            goals_list = [GoalInDB(**g) for g in goals_cursor]
-
-        # early exit
-        if not goals_list:
-            return {}
-
-        # parameters / knobs
-        safety_reserve_pct = 0.05  # keep a small reserve of pool (5%)
-        min_alloc_absolute = 1.00  # don't allocate amounts < $1 (avoid dust)
-        time_penalty_weight = 0.12  # bounded time penalty weight
-        coverage_bonus_weight = 0.18
-        affordability_weight = 0.40  # how much affordability modifies priority
-        ai_weights = {
-            "priority": 0.40,
-            "urgency": 0.30,
-            "impact": 0.18,
-            "health": 0.12
+    def _extract_soa(goals_list: List[Union[GoalInDB, GoalRow]], base_ccy: str) -> Dict[str, list]:
+        """Read the per-goal scoring inputs once into parallel lists (input order)."""
+        now = now_utc()
+        now_ts = now.timestamp()
+        soa: Dict[str, list] = {
+            'gid': [], 'target_in_base': [], 'months_left': [], 'months_left_capped': [],
+            'required_monthly': [], 'priority_n': [], 'urgency_n': [], 'impact_n': [],
+            'health_n': [], 'confidence': [], 'created_at': [],
         }
-
-        # Precompute some pool-derived values
-        initial_pool = pool
-        reserve = round(pool * safety_reserve_pct, 2)
-        working_pool = max(0.0, pool - reserve)
-
-        # build sort key / value computation
-        def goal_score(g: GoalInDB):
-            now = now_utc()
+        # One rate per distinct source currency instead of a conversion per goal; the
+        # common all-goals-in-base-currency case needs no FX lookup at all
+        ccys = {(_goal_field(g, 'currency') or base_ccy).upper() for g in goals_list}
+        rates = {base_ccy: 1.0} if ccys == {base_ccy} else currency_service.get_rates_to(base_ccy, ccys)
+        for g in goals_list:
+            is_row = isinstance(g, dict)
             # time metrics
-            if g.target_date:
+            target_date = _goal_field(g, 'target_date')
+            target_ts = now_ts
+            if target_date:
                 try:
-                    target_dt = ensure_utc(g.target_date)
+                    target_ts = ensure_utc(target_date).timestamp()
                 except Exception:
-                    target_dt = now
-            else:
-                target_dt = now
-
-            # days / months left (cap months to 0..240)
-            delta_days = (target_dt - now).total_seconds() / 86400.0
+                    target_ts = now_ts
+            # days / months left (cap months to 0..240); plain epoch-second floats,
+            # no timedelta per goal
+            delta_days = (target_ts - now_ts) / 86400.0
             months_left = max(0.0, delta_days / 30.0)
             months_left_capped = min(240.0, months_left)  # 20 years cap
 
             # target in base currency
             try:
-                target_amt = float(g.target_amount or 0.0)
+                target_amt = float(_goal_field(g, 'target_amount') or 0.0)
             except Exception:
                 target_amt = 0.0
-            g_ccy = (g.currency or base_ccy).upper()
-            target_in_base = currency_service.convert_amount(target_amt, g_ccy, base_ccy)
-
+            g_ccy = (_goal_field(g, 'currency') or base_ccy).upper()
+            # Same 2-decimal rounding as currency_service.convert_amount
+            target_in_base = round(target_amt * rates[g_ccy], 2)
+
+            soa['gid'].append(str(_goal_field(g, 'id')))
+            soa['target_in_base'].append(target_in_base)
+            soa['months_left'].append(months_left)
+            soa['months_left_capped'].append(months_left_capped)
             # required monthly to hit target on time
-            required_monthly = target_in_base / max(1.0, months_left_capped)
-
+            soa['required_monthly'].append(target_in_base / max(1.0, months_left_capped))
             # AI fields normalized 0..1
-            priority_n = Allocator._safe_pct_field(g, 'ai_priority', 'priority_score', default=0.5)
-            urgency_n = Allocator._safe_pct_field(g, 'ai_urgency', 'urgency', default=0.0)
-            impact_n = Allocator._safe_pct_field(g, 'ai_impact', 'financial_impact', default=0.0)
-            health_n = Allocator._safe_pct_field(g, 'ai_health_impact', 'health_impact', default=0.0)
-            confidence = Allocator._safe_pct_field(g, 'ai_confidence', 'confidence', default=0.6)
+            for key, names, getter, default in _ALLOCATOR_PCT_FIELDS:
+                vals = tuple(map(g.get, names)) if is_row else getter(g)
+                soa[key].append(Allocator._pct_from_values(vals, default))
+            soa['created_at'].append(_goal_field(g, 'created_at', now) or now)
+        return soa
 
+    @staticmethod
+    def _compute_values(soa: Dict[str, list], working_pool: float, monthly_savings_est: float, *,
+                        ai_weights: Dict[str, float], affordability_weight: float,
+                        coverage_bonus_weight: float, time_penalty_weight: float) -> tuple[List[float], List[float]]:
+        """Score every goal in one flat loop.
+
+        Returns (values, urgency_scored) where urgency_scored includes the time-based
+        inference used for scoring/tie-breaks (Pass 1 uses the raw AI urgency).
+        """
+        values: List[float] = []
+        urgency_scored: List[float] = []
+        w_p, w_u, w_i, w_h = ai_weights['priority'], ai_weights['urgency'], ai_weights['impact'], ai_weights['health']
+        for target_in_base, months_left, months_left_capped, required_monthly, priority_n, urgency_n, impact_n, health_n, confidence in zip(
+            soa['target_in_base'], soa['months_left'], soa['months_left_capped'], soa['required_monthly'],
+            soa['priority_n'], soa['urgency_n'], soa['impact_n'], soa['health_n'], soa['confidence'],
+        ):
             # If AI urgency not provided, infer from time left (0 when >24 months, 1 when due or overdue)
-            if urgency_n is None or urgency_n == 0.0:
+            if urgency_n == 0.0:
                 urgency_inferred = 0.0
                 if months_left_capped <= 24.0:
                     urgency_inferred = max(0.0, min(1.0, 1.0 - (months_left_capped / 24.0)))
-                urgency_n = max(urgency_n or 0.0, urgency_inferred)
+                urgency_n = max(urgency_n, urgency_inferred)
 
             # Affordability: how realistic is hitting target given user's monthly savings
-            affordability = 0.0
             if required_monthly > 0:
                 affordability = max(0.0, min(1.0, monthly_savings_est / required_monthly))
             else:
@@ -914,14 +1412,14 @@ class Allocator:
             else:
                 time_pressure = max(0.0, min(1.0, 3.0 / months_left))
 
-            # AI base score (weighted)
+            # AI base score (weighted); confidence downscales score if uncertain
             ai_base = (
-                ai_weights['priority'] * priority_n +
-                ai_weights['urgency'] * urgency_n +
-                ai_weights['impact'] * impact_n +
-                ai_weights['health'] * health_n
+                w_p * priority_n +
+                w_u * urgency_n +
+                w_i * impact_n +
+                w_h * health_n
             )
-            ai_score = ai_base * confidence  # confidence downscales score if uncertain
+            ai_score = ai_base * confidence
 
             # Compose final value:
             # start with ai_score scaled by pool + an affordability multiplier + coverage bonus - time penalty
@@ -930,152 +1428,176 @@ class Allocator:
                 + coverage_bonus_weight * coverage * working_pool
                 - (time_penalty_weight * time_pressure * min(1.0, target_in_base / max(1.0, working_pool)) * working_pool)
             )
+            values.append(float(value or 0.0))
+            urgency_scored.append(float(urgency_n))
+        return values, urgency_scored
 
-            # Secondary sort keys to break ties
-            created_at = getattr(g, 'created_at', now) or now
-            return (
-                float(value or 0.0),
-                float(priority_n),
-                float(urgency_n),
-                -months_left,          # sooner (less months) comes first
-                created_at
-            )
+    @staticmethod
+    def compute_allocations(user_id: str, db, *, sort_by: str = 'algorithmic', cache_id: str | None = None, goals_list: List[Union[GoalInDB, GoalRow]] | None = None) -> Dict[str, float]:
+        """Improved allocation algorithm: two-pass (secure urgent needs, then proportional by value).
+        Returns mapping goal_id -> allocation (base currency amount, rounded to 2 decimals).
+        """
+        # --- Gather pool and base currency ---
+        lifetime = calculate_lifetime_transaction_summary(user_id, db, cache_id=cache_id) or {}
+        pool = max(float(lifetime.get('current_balance', 0) or 0), 0.0)
+        if pool == 0:
+            return {}
+
+        # Optional: monthly savings estimate (fallbacks)
+        monthly_savings_est = None
+        # prefer explicit field if available
+        if lifetime.get('monthly_net_savings') is not None:
+            try:
+                monthly_savings_est = float(lifetime.get('monthly_net_savings') or 0.0)
+            except Exception:
+                monthly_savings_est = None
+        # fallback to an approximate (pool/12) if unknown
+        if monthly_savings_est is None or monthly_savings_est <= 0:
+            monthly_savings_est = max(0.0, pool / 12.0)
+
+        # Fetch goals unless provided by caller: only the scoring fields, kept as raw
+        # rows since scoring reads a handful of scalars and never needs validation
+        if goals_list is None:
+            projection = _ALLOC_PROJECTION
+            if sort_by != 'algorithmic' and sort_by not in projection:
+                projection = {**projection, sort_by: 1}
+            goals_cursor = db.goals.find({"user_id": user_id, "is_completed": False}, projection).batch_size(_SMALL_DOC_BATCH_SIZE)
+            goals_list = [_goal_row(g) for g in goals_cursor]
+
+        # early exit
+        if not goals_list:
+            return {}
+
+        # Base currency is only needed once there is something to allocate
+        base_ccy = (User.get_list_prefs(user_id, db) or {}).get('default_currency', 'USD').upper()
+
+        # parameters / knobs
+        safety_reserve_pct = 0.05  # keep a small reserve of pool (5%)
+        min_alloc_absolute = 1.00  # don't allocate amounts < $1 (avoid dust)
+        time_penalty_weight = 0.12  # bounded time penalty weight
+        coverage_bonus_weight = 0.18
+        affordability_weight = 0.40  # how much affordability modifies priority
+        ai_weights = {
+            "priority": 0.40,
+            "urgency": 0.30,
+            "impact": 0.18,
+            "health": 0.12
+        }
+
+        # Precompute some pool-derived values
+        reserve = round(pool * safety_reserve_pct, 2)
+        working_pool = max(0.0, pool - reserve)
+
+        # Struct-of-arrays: read every per-goal input once, score once, and reuse the
+        # arrays for the sort, both passes and the final top-up.
+        soa = Allocator._extract_soa(goals_list, base_ccy)
+        values, urgency_scored = Allocator._compute_values(
+            soa, working_pool, monthly_savings_est,
+            ai_weights=ai_weights,
+            affordability_weight=affordability_weight,
+            coverage_bonus_weight=coverage_bonus_weight,
+            time_penalty_weight=time_penalty_weight,
+        )
 
         # Sort goals by algorithmic value by default
+        n = len(goals_list)
         if sort_by == 'algorithmic':
-            goals_list.sort(key=goal_score, reverse=True)
+            # Secondary keys break ties: priority, (inferred) urgency, sooner target, created_at
+            keys = list(zip(values, soa['priority_n'], urgency_scored, [-m for m in soa['months_left']], soa['created_at']))
+            order = sorted(range(n), key=keys.__getitem__, reverse=True)
         else:
-            goals_list.sort(key=lambda g: getattr(g, sort_by) or getattr(g, 'created_at') or now_utc())
+            fallback_dt = now_utc()
+            order = sorted(range(n), key=lambda i: _goal_field(goals_list[i], sort_by) or _goal_field(goals_list[i], 'created_at') or fallback_dt)
+        # Callers observe the sorted list (sorted in place historically)
+        goals_list[:] = [goals_list[i] for i in order]
+        gids = [soa['gid'][i] for i in order]
+        t_base = [soa['target_in_base'][i] for i in order]
+        req_monthly = [soa['required_monthly'][i] for i in order]
+        # Positions (in priority order) of high-urgency goals (AI urgency_n >= 0.75); usually few or none
+        urgent = [k for k, i in enumerate(order) if soa['urgency_n'][i] >= 0.75]
+        values = [values[i] for i in order]
+
+        # All allocation arithmetic runs in integer cents: exact, no per-step round(x, 2)
+        # and no drift that could push the total past the pool
+        t_cents = [int(round(t * 100)) for t in t_base]
+        min_alloc_cents = int(round(min_alloc_absolute * 100))
 
         # --- First pass: ensure urgent goals get at least the 'next-month' required funding if affordable ---
-        allocations: Dict[str, float] = {}
-        remaining_pool = working_pool
-
-        # Helper to compute current target_in_base and required_monthly per goal
-        def target_and_required(g):
-            try:
-                t = float(g.target_amount or 0.0)
-            except Exception:
-                t = 0.0
-            ccy = (g.currency or base_ccy).upper()
-            t_base = currency_service.convert_amount(t, ccy, base_ccy)
-            now = now_utc()
-            if getattr(g, 'target_date', None):
-                try:
-                    months_left = max(0.0, (ensure_utc(g.target_date) - now).total_seconds() / 86400.0 / 30.0)
-                except Exception:
-                    months_left = 0.0
-            else:
-                months_left = 0.0
-            months_left = min(240.0, months_left)
-            req_monthly = t_base / max(1.0, months_left) if months_left > 0 else t_base
-            return t_base, req_monthly, months_left
+        alloc_cents: Dict[str, int] = {}
+        remaining_cents = int(round(working_pool * 100))
 
         # Pass 1: for goals with high urgency (urgency_n >= 0.75), try to allocate a single-month required amount (capped)
-        for g in goals_list:
-            gid = str(g.id)
-            t_base, req_monthly, months_left = target_and_required(g)
-            urgency_n = Allocator._safe_pct_field(g, 'ai_urgency', 'urgency', default=0.0)
-            if urgency_n is None:
-                # infer if missing
-                if months_left <= 24.0:
-                    urgency_n = max(0.0, min(1.0, 1.0 - (months_left / 24.0)))
-                else:
-                    urgency_n = 0.0
-
-            # high-urgency threshold
-            if urgency_n >= 0.75 and remaining_pool > 0 and req_monthly > 0:
+        for i in urgent:
+            gid = gids[i]
+            if remaining_cents > 0 and req_monthly[i] > 0:
                 # allocate min(req_monthly, remaining_pool, t_base) but leave min reserve
-                alloc = min(remaining_pool, req_monthly, t_base)
+                alloc = min(remaining_cents, int(round(req_monthly[i] * 100)), t_cents[i])
                 # avoid dust allocations
-                if alloc < min_alloc_absolute:
-                    alloc = 0.0
-                else:
-                    alloc = round(alloc, 2)
-                    allocations[gid] = allocations.get(gid, 0.0) + alloc
-                    remaining_pool = round(remaining_pool - alloc, 2)
+                if alloc >= min_alloc_cents:
+                    alloc_cents[gid] = alloc_cents.get(gid, 0) + alloc
+                    remaining_cents -= alloc
 
         # Pass 2: allocate remaining_pool proportionally by computed 'value' (greedy but normalized)
         # compute numeric values
-        values = []
-        for g in goals_list:
-            gid = str(g.id)
-            v_tuple = goal_score(g)
-            v = max(0.0, float(v_tuple[0]))
+        pass2 = []
+        for i in range(n):
+            gid = gids[i]
+            v = max(0.0, float(values[i]))
             # reduce value for goals already fully funded by first-pass allocations
-            t_base, _, _ = target_and_required(g)
-            already = allocations.get(gid, 0.0)
-            remaining_to_goal = max(0.0, t_base - already)
+            remaining_to_goal = max(0, t_cents[i] - alloc_cents.get(gid, 0))
             if remaining_to_goal <= 0:
                 v = 0.0
-            values.append((g, gid, v, remaining_to_goal, t_base))
+            pass2.append((gid, v, remaining_to_goal))
 
-        total_value = sum(v for (_, _, v, _, _) in values) or 0.0
+        total_value = sum(v for (_, v, _) in pass2) or 0.0
 
         # If total_value is zero (no positive value), fallback to FIFO/earliest created
         if total_value <= 0.0:
-            for g, gid, _, remaining_to_goal, t_base in values:
-                if remaining_pool <= 0:
+            for gid, _, remaining_to_goal in pass2:
+                if remaining_cents <= 0:
                     break
                 if remaining_to_goal <= 0:
                     continue
-                alloc = min(remaining_pool, remaining_to_goal)
-                if alloc < min_alloc_absolute:
+                alloc = min(remaining_cents, remaining_to_goal)
+                if alloc < min_alloc_cents:
                     continue
-                alloc = round(alloc, 2)
-                allocations[gid] = allocations.get(gid, 0.0) + alloc
-                remaining_pool = round(remaining_pool - alloc, 2)
+                alloc_cents[gid] = alloc_cents.get(gid, 0) + alloc
+                remaining_cents -= alloc
         else:
-            # distribute proportionally to v / total_value, but also cap to remaining_to_goal
-            for g, gid, v, remaining_to_goal, t_base in sorted(values, key=lambda x: x[2], reverse=True):
-                if remaining_pool <= 0:
+            # distribute proportionally to v / total_value, but also cap to remaining_to_goal.
+            # Goals are popped lazily by descending value (ties keep list order) since the
+            # pool usually runs dry after a few goals.
+            heap = [(-v, i) for i, (_, v, remaining_to_goal) in enumerate(pass2) if v > 0 and remaining_to_goal > 0]
+            heapq.heapify(heap)
+            while heap:
+                gid, v, remaining_to_goal = pass2[heapq.heappop(heap)[1]]
+                if remaining_cents <= 0:
                     break
-                if v <= 0 or remaining_to_goal <= 0:
-                    continue
-                share = v / total_value
-                desired = remaining_pool * share
-                alloc = min(desired, remaining_to_goal, remaining_pool)
+                desired = int(round(remaining_cents * (v / total_value)))
+                alloc = min(desired, remaining_to_goal, remaining_cents)
                 # avoid tiny allocations
-                if alloc < min_alloc_absolute:
+                if alloc < min_alloc_cents:
                     continue
-                alloc = round(alloc, 2)
-                allocations[gid] = allocations.get(gid, 0.0) + alloc
-                remaining_pool = round(remaining_pool - alloc, 2)
-                total_value -= v  # conservative: remove this goal's value so next shares adjust
-
-        # Final step: if rounding left some cents and a small positive remaining_pool, add it to highest priority goal that still needs it
-        if remaining_pool >= 0.01:
-            # find candidate with remaining need
-            candidates = [(gid, (t := currency_service.convert_amount(float(g.target_amount or 0.0),
-                                                                         (g.currency or base_ccy).upper(), base_ccy) - allocations.get(str(g.id), 0.0)))
-                          for g in goals_list for gid in [str(g.id)]]
-            # pick candidate with positive remaining need and highest ai priority
-            candidate = None
-            for g in goals_list:
-                gid = str(g.id)
-                need = (currency_service.convert_amount(float(g.target_amount or 0.0),
-                                                        (g.currency or base_ccy).upper(), base_ccy)
-                        - allocations.get(gid, 0.0))
-                if need > 0.01:
-                    candidate = (gid, need)
+                alloc_cents[gid] = alloc_cents.get(gid, 0) + alloc
+                remaining_cents -= alloc
+                # Shrinking total_value alongside remaining_pool keeps each uncapped share at
+                # pool * v / total (same as one proportional pass) while surplus from goals
+                # capped at remaining_to_goal flows on to the lower-valued goals
+                total_value -= v
+
+        # Final step: if rounding left some cents, add them to the highest priority goal that still needs it
+        if remaining_cents > 0:
+            # first goal in priority order with remaining need (targets already in base currency)
+            for i in range(n):
+                gid = gids[i]
+                need = t_cents[i] - alloc_cents.get(gid, 0)
+                if need > 1:
+                    add = min(remaining_cents, need)
+                    alloc_cents[gid] = alloc_cents.get(gid, 0) + add
+                    remaining_cents -= add
                     break
-            if candidate:
-                gid, need = candidate
-                add = min(round(remaining_pool, 2), need)
-                if add >= 0.01:
-                    allocations[gid] = allocations.get(gid, 0.0) + add
-                    remaining_pool = round(remaining_pool - add, 2)
-
-        # ensure all allocations are rounded to 2 decimals and no negatives
-        for k in list(allocations.keys()):
-            allocations[k] = round(max(0.0, allocations[k]), 2)
-
-        # ensure we never allocate more than initial pool (safety clamp)
-        total_alloc = round(sum(allocations.values()), 2)
-        if total_alloc > initial_pool:
-            # scale down proportionally
-            scale = initial_pool / total_alloc
-            for k in allocations:
-                allocations[k] = round(allocations[k] * scale, 2)
 
+        # Integer cents never exceed the working pool, so no rounding clean-up or
+        # proportional scale-down is needed before converting back
+        allocations: Dict[str, float] = {gid: c / 100.0 for gid, c in alloc_cents.items()}
         return allocations
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
 
 # Transaction category constants (centralized to avoid magic strings)
 CAT_LENT_OUT = 'lent out'
@@ -11,6 +15,16 @@ CAT_BORROWED = 'borrowed'
 CAT_REPAID_BY_ME = 'repaid by me'
 CAT_REPAID_TO_ME = 'repaid to me'
 LOAN_RELATED_CATEGORIES = [CAT_LENT_OUT, CAT_BORROWED, CAT_REPAID_BY_ME, CAT_REPAID_TO_ME]
+# Categories feeding each loan direction
+_GIVEN_CATS = frozenset((CAT_LENT_OUT, CAT_REPAID_TO_ME))
+_TAKEN_CATS = frozenset((CAT_BORROWED, CAT_REPAID_BY_ME))
+# category -> (loan direction, is repayment)
+_DISPATCH = {
+    CAT_LENT_OUT: ('given', False),
+    CAT_BORROWED: ('taken', False),
+    CAT_REPAID_BY_ME: ('taken', True),
+    CAT_REPAID_TO_ME: ('given', True),
+}
 
 
 
@@ -44,35 +58,54 @@ class Loan:
         return n if n else None
 
     @staticmethod
-    def _get_open_loan(db, user_id: str, direction: str, counterparty: str) -> Optional[Dict[str, Any]]:
-        return db.loans.find_one({
+    def _add_to_open_loan(db, *, user_id: str, direction: str, counterparty: str, amount: float, base_currency: str, now: datetime, tx_id: Optional[ObjectId] = None) -> None:
+        """Increase the open loan for the pair, creating it if none exists (one atomic upsert)."""
+        on_insert: Dict[str, Any] = {
+            'base_currency': base_currency,
+            'created_at': now,
+            'closed_at': None,
+            'notes': [],
+        }
+        update: Dict[str, Any] = {
+            '$inc': {'principal_amount': float(amount), 'outstanding_amount': float(amount)},
+            '$setOnInsert': on_insert,
+        }
+        if tx_id:
+            update['$addToSet'] = {'transactions': tx_id}
+        else:
+            on_insert['transactions'] = []
+        db.loans.update_one({
             'user_id': user_id,
             'direction': direction,
             'counterparty': counterparty,
             'status': 'open'
-        })
+        }, update, upsert=True)
 
     @staticmethod
-    def _create_new(db, *, user_id: str, direction: str, counterparty: str, amount: float, base_currency: str, tx_id: Optional[ObjectId] = None, notes: Optional[str] = None) -> ObjectId:
-        doc = {
+    def _repay_open_loan(db, *, user_id: str, direction: str, counterparty: str, amount: float, now: datetime, tx_id: Optional[ObjectId] = None) -> None:
+        """Reduce the open loan for the pair (never below zero), closing it when paid off.
+
+        Runs as a single pipeline update so the clamp and close happen on the
+        server without a prior read.
+        """
+        closing = {'$lte': ['$outstanding_amount', 0.00001]}
+        set_doc: Dict[str, Any] = {
+            'status': {'$cond': [closing, 'closed', 'open']},
+            'closed_at': {'$cond': [closing, now, '$closed_at']},
+            'outstanding_amount': {'$cond': [closing, 0.0, '$outstanding_amount']},
+        }
+        if tx_id:
+            txs = {'$ifNull': ['$transactions', []]}
+            set_doc['transactions'] = {'$cond': [{'$in': [tx_id, txs]}, txs, {'$concatArrays': [txs, [tx_id]]}]}
+        db.loans.update_one({
             'user_id': user_id,
             'direction': direction,
             'counterparty': counterparty,
-            'principal_amount': float(amount),
-            'outstanding_amount': float(amount),
-            'base_currency': base_currency,
-            'status': 'open',
-            'created_at': datetime.now(timezone.utc),
-            'closed_at': None,
-            'notes': [notes] if notes else [],
-            'transactions': [tx_id] if tx_id else []
-        }
-        return db.loans.insert_one(doc).inserted_id
-
-    @staticmethod
-    def _append_tx(db, loan_id: ObjectId, tx_id: Optional[ObjectId]):
-        if tx_id:
-            db.loans.update_one({'_id': loan_id}, {'$addToSet': {'transactions': tx_id}})
+            'status': 'open'
+        }, [
+            {'$set': {'outstanding_amount': {'$max': [0.0, {'$subtract': [{'$ifNull': ['$outstanding_amount', 0.0]}, float(amount)]}]}}},
+            {'$set': set_doc},
+        ])
 
     @staticmethod
     def list_user_loans(user_id: str, db, include_closed: bool = True) -> List[Dict[str, Any]]:
@@ -168,98 +201,102 @@ class Loan:
         - related_person (counterparty)
         - type: 'income' | 'expense' (informational)
         """
-        category = (tx.get('category') or '').strip().lower()
+        entry = _DISPATCH.get((tx.get('category') or '').strip().lower())
+        if entry is None:
+            # other categories ignored
+            return
         counterparty = Loan._normalize_name(tx.get('related_person'))
         amount = float(tx.get('amount') or 0.0)
-        base_currency = (tx.get('base_currency') or 'USD').upper()
         if amount <= 0 or not counterparty:
             return
 
-        if category == CAT_LENT_OUT:
-            existing = Loan._get_open_loan(db, user_id, 'given', counterparty)
-            if existing:
-                db.loans.update_one({'_id': existing['_id']}, {
-                    '$inc': {'principal_amount': amount, 'outstanding_amount': amount}
-                })
-                Loan._append_tx(db, existing['_id'], tx_id)
-            else:
-                Loan._create_new(db, user_id=user_id, direction='given', counterparty=counterparty, amount=amount, base_currency=base_currency, tx_id=tx_id)
-        elif category == CAT_BORROWED:
-            existing = Loan._get_open_loan(db, user_id, 'taken', counterparty)
-            if existing:
-                db.loans.update_one({'_id': existing['_id']}, {
-                    '$inc': {'principal_amount': amount, 'outstanding_amount': amount}
-                })
-                Loan._append_tx(db, existing['_id'], tx_id)
-            else:
-                Loan._create_new(db, user_id=user_id, direction='taken', counterparty=counterparty, amount=amount, base_currency=base_currency, tx_id=tx_id)
-        elif category == CAT_REPAID_BY_ME:
-            existing = Loan._get_open_loan(db, user_id, 'taken', counterparty)
-            if existing:
-                new_out = max(0.0, float(existing.get('outstanding_amount', 0.0)) - amount)
-                updates: Dict[str, Any] = {'$set': {'outstanding_amount': new_out}}
-                if tx_id:
-                    updates['$addToSet'] = {'transactions': tx_id}
-                db.loans.update_one({'_id': existing['_id']}, updates)
-                if new_out <= 0.00001:
-                    db.loans.update_one({'_id': existing['_id']}, {'$set': {'status': 'closed', 'closed_at': datetime.now(timezone.utc), 'outstanding_amount': 0.0}})
-        elif category == CAT_REPAID_TO_ME:
-            existing = Loan._get_open_loan(db, user_id, 'given', counterparty)
-            if existing:
-                new_out = max(0.0, float(existing.get('outstanding_amount', 0.0)) - amount)
-                updates: Dict[str, Any] = {'$set': {'outstanding_amount': new_out}}
-                if tx_id:
-                    updates['$addToSet'] = {'transactions': tx_id}
-                db.loans.update_one({'_id': existing['_id']}, updates)
-                if new_out <= 0.00001:
-                    db.loans.update_one({'_id': existing['_id']}, {'$set': {'status': 'closed', 'closed_at': datetime.now(timezone.utc), 'outstanding_amount': 0.0}})
-        # other categories ignored
+        direction, repay = entry
+        now = datetime.now(timezone.utc)
+        if repay:
+            Loan._repay_open_loan(db, user_id=user_id, direction=direction, counterparty=counterparty, amount=amount, now=now, tx_id=tx_id)
+        else:
+            base_currency = (tx.get('base_currency') or 'USD').upper()
+            Loan._add_to_open_loan(db, user_id=user_id, direction=direction, counterparty=counterparty, amount=amount, base_currency=base_currency, now=now, tx_id=tx_id)
 
     @staticmethod
     def recompute_counterparty(user_id: str, db, counterparty: str) -> None:
-        """Rebuild loan(s) for a counterparty from remaining transactions."""
+        """Rebuild loan(s) for a counterparty from remaining transactions.
+
+        Both loans take base_currency from the earliest loan transaction (by date,
+        then _id) that has one, whichever direction it belongs to; USD if none do.
+        """
         cp = Loan._normalize_name(counterparty)
         if not cp:
             return
-        txs = list(db.transactions.find({
+        match = {
             'user_id': user_id,
             'related_person': cp,
             'category': {'$in': LOAN_RELATED_CATEGORIES}
-        }))
+        }
+        amount = {'$convert': {'input': '$amount', 'to': 'double', 'onError': 0.0, 'onNull': 0.0}}
+        # Deterministic scan order for tx ids and the base currency pick
+        order = [('date', 1), ('_id', 1)]
+        pipeline = [
+            {'$match': match},
+            {'$sort': dict(order)},
+            # One row per direction; principal vs repaid split by category
+            {'$group': {
+                '_id': {'$cond': [{'$in': ['$category', sorted(_GIVEN_CATS)]}, 'given', 'taken']},
+                'principal': {'$sum': {'$cond': [{'$in': ['$category', [CAT_LENT_OUT, CAT_BORROWED]]}, amount, 0.0]}},
+                'repaid': {'$sum': {'$cond': [{'$in': ['$category', [CAT_REPAID_TO_ME, CAT_REPAID_BY_ME]]}, amount, 0.0]}},
+                'tx_ids': {'$push': '$_id'},
+            }},
+        ]
+        try:
+            rows = {r['_id']: r for r in db.transactions.aggregate(pipeline)}
+        except OperationFailure:
+            logger.exception('Loan recompute aggregate failed for %s; summing client-side', cp)
+            rows = None
+
+        if rows is not None:
+            empty: Dict[str, Any] = {'principal': 0.0, 'repaid': 0.0, 'tx_ids': []}
+            given = rows.get('given', empty)
+            taken = rows.get('taken', empty)
+            given_principal, given_repaid, given_tx_ids = float(given['principal']), float(given['repaid']), given['tx_ids']
+            taken_principal, taken_repaid, taken_tx_ids = float(taken['principal']), float(taken['repaid']), taken['tx_ids']
+            first = db.transactions.find_one(
+                {**match, 'base_currency': {'$type': 'string', '$ne': ''}}, {'base_currency': 1}, sort=order
+            ) if rows else None
+            base_currency = first['base_currency'] if first else None
+        else:
+            # Fallback: sum client-side if aggregate is unsupported
+            txs = list(db.transactions.find(match).sort(order))
 
-        def sum_amount(fn):
-            total = 0.0
+            totals = dict.fromkeys(LOAN_RELATED_CATEGORIES, 0.0)
+            given_tx_ids, taken_tx_ids = [], []
+            base_currency = None
             for t in txs:
+                cat = (t.get('category') or '').lower()
+                if cat in _GIVEN_CATS:
+                    given_tx_ids.append(t['_id'])
+                elif cat in _TAKEN_CATS:
+                    taken_tx_ids.append(t['_id'])
+                else:
+                    continue
+                bc = t.get('base_currency')
+                if base_currency is None and isinstance(bc, str) and bc:
+                    base_currency = bc
                 try:
-                    if fn(t):
-                        total += float(t.get('amount', 0.0))
+                    totals[cat] += float(t.get('amount', 0.0))
                 except Exception:
                     pass
-            return total
-
-        base_currency = 'USD'
-        for t in txs:
-            bc = t.get('base_currency')
-            if isinstance(bc, str) and bc:
-                base_currency = bc.upper()
-                break
-
-        given_principal = sum_amount(lambda t: (t.get('category') or '').lower() == CAT_LENT_OUT)
-        given_repaid = sum_amount(lambda t: (t.get('category') or '').lower() == CAT_REPAID_TO_ME)
+            given_principal, given_repaid = totals[CAT_LENT_OUT], totals[CAT_REPAID_TO_ME]
+            taken_principal, taken_repaid = totals[CAT_BORROWED], totals[CAT_REPAID_BY_ME]
+        base_currency = (base_currency or 'USD').upper()
         given_out = max(0.0, given_principal - given_repaid)
-        given_tx_ids = [t['_id'] for t in txs if (t.get('category') or '').lower() in {CAT_LENT_OUT, CAT_REPAID_TO_ME}]
-
-        taken_principal = sum_amount(lambda t: (t.get('category') or '').lower() == CAT_BORROWED)
-        taken_repaid = sum_amount(lambda t: (t.get('category') or '').lower() == CAT_REPAID_BY_ME)
         taken_out = max(0.0, taken_principal - taken_repaid)
-        taken_tx_ids = [t['_id'] for t in txs if (t.get('category') or '').lower() in {CAT_BORROWED, CAT_REPAID_BY_ME}]
+        now = datetime.now(timezone.utc)
 
         def upsert(direction: str, principal: float, outstanding: float, tx_ids: list[ObjectId]):
             if principal <= 0.0 and outstanding <= 0.0 and not tx_ids:
                 db.loans.delete_many({'user_id': user_id, 'direction': direction, 'counterparty': cp})
                 return
             status = 'closed' if outstanding <= 0.00001 else 'open'
-            now = datetime.now(timezone.utc)
             db.loans.update_one(
                 {'user_id': user_id, 'direction': direction, 'counterparty': cp},
                 {
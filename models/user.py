@@ -17,6 +17,11 @@ from utils.timezone_utils import now_utc, ensure_utc
 
 """Duration map moved to finance_calculator.DURATION_MAP to ensure single source of truth."""
 
+# The preferences list endpoints read on every call (sort modes, base currency).
+# Read fresh each time: a per-process cache would serve other gunicorn workers stale
+# sort modes after a change, and this is a single projected _id lookup.
+_PREFS_PROJECTION = {'sort_modes': 1, 'default_currency': 1}
+
 class User(UserMixin):
     id: str
     email: str
@@ -148,6 +153,34 @@ class User(UserMixin):
         self.sort_modes[name] = sort
         return True
 
+    @classmethod
+    def get_list_prefs(cls, user_id: str, db: Database) -> dict | None:
+        """Return {'sort_modes', 'default_currency'} for a user via one projected read.
+
+        Returns None if the user does not exist. sort_modes is merged over the
+        class defaults like the instance attribute.
+        """
+        user_doc = db.users.find_one({'_id': ObjectId(user_id)}, _PREFS_PROJECTION)
+        if not user_doc:
+            return None
+        prefs = {
+            'sort_modes': {**cls.DEFAULT_SORT_MODES, **(user_doc.get('sort_modes') or {})},
+            'default_currency': user_doc.get('default_currency', 'USD'),
+        }
+        return prefs
+
+    @classmethod
+    def get_list_sort_mode(cls, user_id: str, name: str, db: Database, default: str | None = None):
+        """Projected equivalent of get_by_id(...).get_sort_mode(name) for list endpoints."""
+        prefs = cls.get_list_prefs(user_id, db)
+        if prefs is None:
+            return default
+        val = prefs['sort_modes'].get(name)
+        allowed = cls.SORT_MODE_OPTIONS.get(name)
+        if val and allowed and val in allowed:
+            return val
+        return cls.DEFAULT_SORT_MODES.get(name, default)
+
     @classmethod
     def get_by_email(cls, email: str, db: Database):
         user_doc = db.users.find_one({'email': email})
@@ -24,7 +24,7 @@ def init_analysis_blueprint(mongo, ai_engine):
 
             # Use centralized helper to prepare goals for view (honors user sort preference)
             # Reuse the same cache session so allocations and progress can use cached txs
-            prep = Goal.prepare_goals_for_view(current_user.id, mongo.db, include_completed=False, page=1, per_page=100, sort_mode=user_goal_sort, projection={'ai_plan': 0}, cache_id=cache_id)
+            prep = Goal.prepare_goals_for_view(current_user.id, mongo.db, include_completed=False, page=1, per_page=100, sort_mode=user_goal_sort, cache_id=cache_id)
             goals = prep['items']
 
             user = user_doc
@@ -10,7 +10,7 @@ from utils.timezone_utils import now_utc, ensure_utc
 from utils.finance_calculator import calculate_monthly_summary
 from utils.currency import currency_service
 from typing import Any
-import asyncio, threading
+import asyncio
 
 # These are light imports used inside handlers only (avoid circular at import time)
 
@@ -93,27 +93,13 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
     @login_required
     def revalidate_goal(goal_id):  # type: ignore[override]
         try:
-            goal = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id})
+            goal = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id}, {'ai_plan': 0})
             if not goal:
                 flash('Goal not found.', 'danger')
                 return redirect(url_for('goals_bp.goals'))
             if goal.get('ai_plan_paste_url'):
-                async def _del_remote():
-                    from models.goal import Goal as GoalModel
-                    await GoalModel.delete_remote_ai_plan_if_any(goal, pastebin_client)
-                threading.Thread(target=lambda: asyncio.run(_del_remote()), daemon=True).start()
-            thread = threading.Thread(
-                target=lambda: asyncio.run(
-                    Goal._ai_enhance_goal(
-                        ObjectId(goal_id),
-                        goal,
-                        mongo.db,
-                        ai_engine
-                    )
-                ),
-                daemon=True
-            )
-            thread.start()
+                Goal.schedule_remote_plan_delete(goal, pastebin_client)
+            Goal.schedule_ai_enhance(goal['_id'], goal, mongo.db, ai_engine)
             flash('Goal revalidation started. Refresh in a few seconds to see updates.', 'info')
         except Exception:
             flash('Failed to start goal revalidation.', 'danger')
@@ -133,23 +119,22 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
         allowed_sorts = set(allowed) | {''}
         if sort_param not in allowed_sorts:
             sort_param = ''
+        # One user read serves both the persisted sort preference and the base currency
+        user_doc = mongo.db.users.find_one({'_id': ObjectId(current_user.id)}, {'sort_modes': 1, 'default_currency': 1})
         # If client did not explicitly request a sort, prefer user's persisted preference
         if not sort_param:
-            user_doc = mongo.db.users.find_one({'_id': ObjectId(current_user.id)})
             sort_param = (user_doc.get('sort_modes') or {}).get('goals') if user_doc else ''
         if not sort_param:
             sort_param = 'created_desc'
         # List both completed and incomplete goals for the full goals page API; respect sort preference
         total = mongo.db.goals.count_documents({'user_id': current_user.id})
-        proj = {'ai_plan': 0}
-        goal_models = Goal.get_user_goals(current_user.id, mongo.db, skip, per_page, sort_mode=sort_param or 'created_desc', projection=proj)
+        goal_models = Goal.get_user_goals(current_user.id, mongo.db, skip, per_page, sort_mode=sort_param or 'created_desc')
 
         # Cache transactions for the duration of this request to avoid multiple scans
         from utils.finance_calculator import create_cache_session, drop_cache_session
         cache_id = create_cache_session(current_user.id, mongo.db)
         try:
             monthly_summary = calculate_monthly_summary(current_user.id, mongo.db, cache_id=cache_id)
-            user_doc = mongo.db.users.find_one({'_id': ObjectId(current_user.id)})
             user_default_code = (user_doc or {}).get('default_currency', current_app.config['DEFAULT_CURRENCY'])
             allocations = Goal.compute_allocations(current_user.id, mongo.db, cache_id=cache_id)
         finally:
@@ -166,15 +151,14 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
             }, {'_id': 1}))
         else:
             existing_plan_ids = set()
-        for gm in goal_models:
-            alloc_amt = allocations.get(gm.id, None)
-            progress = Goal.calculate_goal_progress(gm, monthly_summary, override_current_amount=alloc_amt, base_currency_code=user_default_code)
+        progresses = Goal.calculate_many_progress(goal_models, monthly_summary, user_default_code, overrides=allocations)
+        for gm, goal_oid, progress in zip(goal_models, page_goal_ids, progresses):
             gdict = gm.model_dump(by_alias=True)
             td = gdict.get('target_date')
             if isinstance(td, datetime):
                 gdict['target_date'] = td.isoformat()
             gdict['progress'] = progress
-            gdict['has_ai_plan'] = (ObjectId(gm.id) in existing_plan_ids) or bool(gdict.get('ai_plan_paste_url'))
+            gdict['has_ai_plan'] = (goal_oid in existing_plan_ids) or bool(gdict.get('ai_plan_paste_url'))
             # Do not leak internal user_id in API responses
             gdict.pop('user_id', None)
             items.append(gdict)
@@ -210,7 +194,7 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
         from utils.finance_calculator import create_cache_session, drop_cache_session
         cache_id = create_cache_session(current_user.id, mongo.db)
         try:
-            prep = Goal.prepare_goals_for_view(current_user.id, mongo.db, include_completed=False, page=page, per_page=per_page, sort_mode=sort_param, projection={'ai_plan': 0}, cache_id=cache_id)
+            prep = Goal.prepare_goals_for_view(current_user.id, mongo.db, include_completed=False, page=page, per_page=per_page, sort_mode=sort_param, cache_id=cache_id)
         finally:
             try:
                 drop_cache_session(cache_id)
@@ -250,6 +234,14 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
 
         return jsonify({'items': trimmed_items, 'total': prep.get('total', 0), 'page': prep.get('page', 1), 'per_page': prep.get('per_page', per_page), 'sort': prep.get('sort', sort_param)})
 
+    @bp.route('/api/goals/prioritized', endpoint='get_prioritized_goals')
+    @login_required
+    def get_prioritized_goals():  # type: ignore[override]
+        if mongo.db is None:
+            return jsonify({'error': 'Database connection error.'}), 500
+        goals = Goal.get_prioritized(current_user.id, mongo.db)
+        return jsonify(goals)
+
     @bp.route('/api/goals', methods=['POST'], endpoint='api_goal_create')
     @login_required
     def api_goal_create():  # type: ignore[override]
@@ -286,10 +278,7 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
         if not goal:
             return jsonify({'error': 'Not found or no changes'}), 404
         try:
-            threading.Thread(
-                target=lambda: asyncio.run(Goal._ai_enhance_goal(goal.id, goal, mongo.db, ai_engine)),
-                daemon=True
-            ).start()
+            Goal.schedule_ai_enhance(goal.id, goal, mongo.db, ai_engine)
             reval_started = True
         except Exception:
             reval_started = False
@@ -311,12 +300,9 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
     @bp.route('/api/goals/<goal_id>', methods=['DELETE'], endpoint='api_goal_delete')
     @login_required
     def api_goal_delete(goal_id):  # type: ignore[override]
-        goal_doc = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id})
+        goal_doc = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id}, {'ai_plan': 0})
         if goal_doc and goal_doc.get('ai_plan_paste_url'):
-            async def _del_remote():
-                from models.goal import Goal as GoalModel
-                await GoalModel.delete_remote_ai_plan_if_any(goal_doc, pastebin_client)
-            threading.Thread(target=lambda: asyncio.run(_del_remote()), daemon=True).start()
+            Goal.schedule_remote_plan_delete(goal_doc, pastebin_client)
         ok = Goal.delete(goal_id, current_user.id, mongo.db)
         if not ok:
             return jsonify({'error': 'Not found'}), 404
@@ -325,21 +311,12 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
     @bp.route('/api/goals/<goal_id>/revalidate', methods=['POST'], endpoint='api_goal_revalidate')
     @login_required
     def api_goal_revalidate(goal_id):  # type: ignore[override]
-        goal = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id})
+        goal = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id}, {'ai_plan': 0})
         if not goal:
             return jsonify({'error': 'Not found'}), 404
         if goal.get('ai_plan_paste_url'):
-            async def _del_remote():
-                from models.goal import Goal as GoalModel
-                await GoalModel.delete_remote_ai_plan_if_any(goal, pastebin_client)
-            threading.Thread(target=lambda: asyncio.run(_del_remote()), daemon=True).start()
-        thread = threading.Thread(
-            target=lambda: asyncio.run(
-                Goal._ai_enhance_goal(ObjectId(goal_id), goal, mongo.db, ai_engine)
-            ),
-            daemon=True
-        )
-        thread.start()
+            Goal.schedule_remote_plan_delete(goal, pastebin_client)
+        Goal.schedule_ai_enhance(goal['_id'], goal, mongo.db, ai_engine)
         return jsonify({'success': True, 'message': 'Revalidation started'})
 
     @bp.route('/api/goals/<goal_id>/ai-plan', methods=['GET'], endpoint='get_goal_ai_plan')
@@ -348,8 +325,9 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
         goal_doc = mongo.db.goals.find_one({'_id': ObjectId(goal_id), 'user_id': current_user.id})
         if not goal_doc:
             return jsonify({'error': 'Not found'}), 404
-        if goal_doc.get('ai_plan'):
-            return jsonify({'plan': goal_doc.get('ai_plan'), 'offloaded': False})
+        plan = Goal.get_ai_plan(goal_doc)
+        if plan:
+            return jsonify({'plan': plan, 'offloaded': False})
         url = goal_doc.get('ai_plan_paste_url')
         if url and pastebin_client:
             key = pastebin_client.extract_paste_key(url)
@@ -381,17 +359,9 @@ def init_goals_blueprint(mongo, ai_engine, pastebin_client):
         # For each goal, if offloaded plan exists, schedule remote delete, then run AI enhance in background
         def _kick(goal_doc):
             if goal_doc.get('ai_plan_paste_url'):
-                async def _del_remote():
-                    from models.goal import Goal as GoalModel
-                    await GoalModel.delete_remote_ai_plan_if_any(goal_doc, pastebin_client)
-                threading.Thread(target=lambda: asyncio.run(_del_remote()), daemon=True).start()
+                Goal.schedule_remote_plan_delete(goal_doc, pastebin_client)
             try:
-                threading.Thread(
-                    target=lambda: asyncio.run(
-                        Goal._ai_enhance_goal(goal_doc['_id'], goal_doc, mongo.db, ai_engine)
-                    ),
-                    daemon=True
-                ).start()
+                Goal.schedule_ai_enhance(goal_doc['_id'], goal_doc, mongo.db, ai_engine)
             except Exception:
                 pass
         for g in goals:
@@ -4,6 +4,7 @@ from flask_login import login_required, current_user
 from bson import ObjectId
 from typing import Any
 from models.user import User
+from models.goal import decode_ai_plan
 from utils.currency import currency_service
 from utils.timezone_utils import now_utc
 
@@ -180,6 +181,9 @@ def init_profile_blueprint(mongo):
                 for k, v in doc.items():
                     if k == '_id':
                         flat[k] = str(v)
+                    elif k == 'ai_plan':
+                        # goal plans are stored zlib-compressed; export the text
+                        flat[k] = decode_ai_plan(v)
                     else:
                         try:
                             # try to convert ObjectId-like values
@@ -0,0 +1,84 @@
+"""Shared fixtures: an in-memory Mongo (mongomock) and a minimal Flask app for route tests."""
+from __future__ import annotations
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+mongomock = pytest.importorskip('mongomock')
+
+USER_ID = ObjectId('650000000000000000000001')
+
+
+def _bulk_write(self, requests, ordered=True, **kwargs):
+    """Apply pymongo write models one by one.
+
+    mongomock's own bulk_write predates the ``sort`` argument newer pymongo
+    passes to its bulk builder, so it fails on any UpdateOne.
+    """
+    from pymongo import DeleteOne, InsertOne, UpdateMany, UpdateOne
+
+    for op in requests:
+        if isinstance(op, InsertOne):
+            self.insert_one(op._doc)
+        elif isinstance(op, UpdateOne):
+            self.update_one(op._filter, op._doc, upsert=bool(op._upsert))
+        elif isinstance(op, UpdateMany):
+            self.update_many(op._filter, op._doc, upsert=bool(op._upsert))
+        elif isinstance(op, DeleteOne):
+            self.delete_one(op._filter)
+        else:
+            raise TypeError(f'unsupported bulk op {op!r}')
+
+
+mongomock.collection.Collection.bulk_write = _bulk_write
+
+
+@pytest.fixture
+def db():
+    db = mongomock.MongoClient().db
+    db.users.insert_one({'_id': USER_ID, 'email': 'user@example.com', 'default_currency': 'USD'})
+    return db
+
+
+@pytest.fixture
+def user_id() -> str:
+    return str(USER_ID)
+
+
+@pytest.fixture
+def make_client(db):
+    """Build a logged-in test client for an app holding only the given blueprint(s).
+
+    Each argument is a callable taking the ``mongo`` handle and returning a Blueprint,
+    e.g. ``make_client(init_profile_blueprint)``.
+    """
+    from flask import Flask
+    from flask_login import LoginManager
+    from models.user import User
+
+    def _make(*initializers):
+        app = Flask(__name__)
+        app.config.update(TESTING=True, SECRET_KEY='test', DEFAULT_CURRENCY='USD')
+        login_manager = LoginManager(app)
+
+        @login_manager.user_loader
+        def load_user(uid):
+            doc = db.users.find_one({'_id': ObjectId(uid)})
+            return User(doc, db) if doc else None
+
+        mongo = SimpleNamespace(db=db)
+        for init in initializers:
+            app.register_blueprint(init(mongo))
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(USER_ID)
+            sess['_fresh'] = True
+        return client
+
+    return _make
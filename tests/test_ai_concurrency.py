@@ -0,0 +1,85 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import models.goal as goal_mod
+import utils.ai_helper as ai_helper
+from utils.ai_engine import FinancialBrain
+
+SDK_DELAY = 0.2
+
+
+class _SlowModels:
+    def generate_content(self, model, contents):
+        time.sleep(SDK_DELAY)  # synchronous, like the Gemini SDK
+        return SimpleNamespace(text='{"priority_score": 70, "summary": "ok"}')
+
+
+def _brain(tmp_path, monkeypatch) -> FinancialBrain:
+    monkeypatch.chdir(tmp_path)  # _generate_any appends to LOG/ under the cwd
+    brain = FinancialBrain(api_key=None, model_candidates=['m'])
+    brain.client = SimpleNamespace(models=_SlowModels())
+    return brain
+
+
+def test_generate_runs_sdk_call_off_the_event_loop(tmp_path, monkeypatch):
+    brain = _brain(tmp_path, monkeypatch)
+
+    async def main():
+        t0 = time.perf_counter()
+        texts = await asyncio.gather(*(brain.aget_text('p') for _ in range(4)))
+        return texts, time.perf_counter() - t0
+
+    texts, elapsed = asyncio.run(main())
+
+    assert all('priority_score' in t for t in texts)
+    # Serialized on the loop this would take 4 * SDK_DELAY
+    assert elapsed < 2 * SDK_DELAY
+
+
+def test_ai_enhance_goal_keeps_shared_loop_responsive(db, user_id, tmp_path, monkeypatch):
+    brain = _brain(tmp_path, monkeypatch)
+    monkeypatch.setattr(goal_mod, '_get_user_snapshot', lambda uid, _db: SimpleNamespace(id=uid))
+    monkeypatch.setattr(ai_helper, 'build_financial_context', lambda user: {'lifetime_summary': {}})
+
+    async def plan(goal_dict, user, context=None):
+        return await brain.aget_text('plan')
+
+    async def analysis(user, engine, goal_dict, context=None):
+        return await engine.aget_json('analysis')
+
+    monkeypatch.setattr(ai_helper, 'get_goal_plan', plan)
+    monkeypatch.setattr(ai_helper, 'run_goal_priority_analysis', analysis)
+    gid = db.goals.insert_one({'user_id': user_id, 'description': 'Bike'}).inserted_id
+
+    fut = goal_mod.Goal.schedule_ai_enhance(gid, {'user_id': user_id}, db, brain)
+    t0 = time.perf_counter()
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), goal_mod._get_ai_loop()).result(timeout=5)
+    probe = time.perf_counter() - t0
+    fut.result(timeout=5)
+
+    assert probe < SDK_DELAY / 2
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and not db.goals.find_one({'_id': gid, 'ai_priority': 70}):
+        time.sleep(0.02)
+    doc = db.goals.find_one({'_id': gid})
+    assert doc['ai_priority'] == 70
+    assert goal_mod.decode_ai_plan(doc['ai_plan']).startswith('{"priority_score"')
+
+
+def test_schedule_ai_enhance_caps_enrichments_in_flight(monkeypatch):
+    state = {'active': 0, 'peak': 0}
+
+    async def fake_enhance(goal_id, goal_data, db, ai_engine):
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await asyncio.sleep(0.02)
+        state['active'] -= 1
+
+    monkeypatch.setattr(goal_mod.Goal, '_ai_enhance_goal', staticmethod(fake_enhance))
+
+    futs = [goal_mod.Goal.schedule_ai_enhance(i, {}, None, None) for i in range(goal_mod._AI_MAX_CONCURRENCY * 3)]
+    for f in futs:
+        f.result(timeout=5)
+
+    assert state['peak'] == goal_mod._AI_MAX_CONCURRENCY
@@ -0,0 +1,83 @@
+"""Allocation outputs must match the float implementations they replaced.
+
+data/allocations_baseline.json holds the results of Goal.compute_allocations (FIFO
+fill) and Allocator.compute_allocations as they were before the integer-cents
+rewrite, for the fixed goals and FX rates below.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+import mongomock.collection
+import pytest
+from bson import ObjectId
+
+import models.goal as goal_mod
+from models.goal import Allocator, Goal
+from utils.currency import currency_service
+
+RATES = {'USD': 1.0, 'EUR': 1.1, 'BDT': 0.0085, 'JPY': 0.0067}  # USD per unit
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+GOALS = [
+    # (description, target, currency, target_date, created day, AI fields)
+    ('car', 8000.0, 'USD', datetime(2027, 6, 1), 1, dict(ai_priority=70, ai_urgency=40, ai_impact=60, ai_health_impact=10, ai_confidence=80)),
+    ('trip', 1200.55, 'EUR', datetime(2026, 5, 1), 2, dict(ai_priority=55, ai_urgency=90, ai_impact=30, ai_health_impact=0, ai_confidence=70)),
+    ('laptop', 150000.0, 'BDT', datetime(2026, 4, 10), 3, {}),
+    ('fund', 3333.33, 'usd', datetime(2028, 1, 1), 4, dict(ai_priority=90, ai_urgency=20, ai_impact=90, ai_health_impact=50, ai_confidence=60)),
+    ('camera', 99999.0, 'JPY', datetime(2026, 2, 1), 5, dict(ai_priority=30, ai_confidence=40)),
+    ('zero', 0.0, 'USD', datetime(2026, 12, 1), 6, {}),
+]
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'allocations_baseline.json'), encoding='utf-8') as fh:
+    BASELINE = json.load(fh)
+
+
+def _lookup_pipeline_shim(orig):
+    """mongomock lacks uncorrelated $lookup-with-pipeline; run the sub-pipeline per row."""
+    def aggregate(self, pipeline, **kwargs):
+        lookups = [s for s in pipeline if 'pipeline' in s.get('$lookup', {})]
+        if not lookups:
+            return orig(self, pipeline, **kwargs)
+        spec = lookups[0]['$lookup']
+        rows = list(orig(self, [s for s in pipeline if s is not lookups[0]], **kwargs))
+        for row in rows:
+            row[spec['as']] = list(orig(self.database[spec['from']], spec['pipeline']))
+        return iter(rows)
+    return aggregate
+
+
+@pytest.fixture
+def fixed_env(monkeypatch):
+    monkeypatch.setattr(mongomock.collection.Collection, 'aggregate',
+                        _lookup_pipeline_shim(mongomock.collection.Collection.aggregate))
+    monkeypatch.setattr(currency_service, '_usd_per_unit', dict(RATES))
+    monkeypatch.setattr(currency_service, 'supported_currencies', list(RATES))
+    monkeypatch.setattr(currency_service, '_conv_cache', {})
+    monkeypatch.setattr(currency_service, 'trigger_background_refresh_if_stale', lambda: None)
+    monkeypatch.setattr(goal_mod, 'now_utc', lambda: NOW)
+
+
+def _seed(db, user_id, base):
+    db.users.update_one({'_id': ObjectId(user_id)}, {'$set': {'default_currency': base}})
+    for i, (desc, target, ccy, target_date, created_day, ai) in enumerate(GOALS):
+        db.goals.insert_one({
+            '_id': ObjectId('%024x' % (i + 1)), 'user_id': user_id, 'type': 'savings', 'target_amount': target,
+            'currency': ccy, 'description': desc, 'target_date': target_date, 'current_amount': 0.0,
+            'is_completed': False, 'created_at': datetime(2026, 1, created_day), 'last_updated': datetime(2026, 1, 1), **ai,
+        })
+
+
+@pytest.mark.parametrize('key', sorted(BASELINE))
+def test_allocations_match_float_baseline(key, db, user_id, fixed_env, monkeypatch):
+    which, base, pool, savings, sort_by = key.split('|')
+    lifetime = {'current_balance': float(pool)}
+    if savings != 'None':
+        lifetime['monthly_net_savings'] = float(savings)
+    monkeypatch.setattr(goal_mod, 'calculate_lifetime_transaction_summary', lambda *a, **k: dict(lifetime))
+    _seed(db, user_id, base)
+    compute = Goal.compute_allocations if which == 'fifo' else Allocator.compute_allocations
+
+    result = compute(user_id, db, sort_by=sort_by)
+
+    assert result == BASELINE[key]
+    assert sum(result.values()) <= float(pool) + 1e-9
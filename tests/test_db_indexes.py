@@ -0,0 +1,116 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import OperationFailure
+
+import utils.db_indexes as db_indexes
+from config import Config
+from models.goal import Goal
+from utils.db_indexes import index_exists, list_with_hint
+
+
+@pytest.fixture(autouse=True)
+def fresh_index_cache(monkeypatch):
+    monkeypatch.setattr(db_indexes, '_confirmed_indexes', set())
+    monkeypatch.setattr(db_indexes, '_missing_indexes', {})
+
+
+class _Collection:
+    def __init__(self, indexes):
+        self.database = SimpleNamespace(name='db')
+        self.name = 'goals'
+        self.indexes = set(indexes)
+        self.index_info_calls = 0
+
+    def index_information(self):
+        self.index_info_calls += 1
+        return {name: {} for name in self.indexes}
+
+
+class _Cursor:
+    """Minimal cursor: records hints, optionally rejects hinted reads like a server would."""
+
+    def __init__(self, collection, rows, *, reject_hint=False):
+        self.collection = collection
+        self.rows = rows
+        self.reject_hint = reject_hint
+        self.hints = []
+        self.rewound = False
+
+    def hint(self, index):
+        self.hints.append(index)
+        return self
+
+    def rewind(self):
+        self.rewound = True
+        return self
+
+    def __iter__(self):
+        if self.reject_hint and self.hints and self.hints[-1] is not None:
+            raise OperationFailure('error processing query: planner returned error :: bad hint')
+        return iter(self.rows)
+
+
+def test_existing_index_is_hinted():
+    col = _Collection({'idx'})
+    cur = _Cursor(col, [1, 2])
+
+    assert list_with_hint(cur, 'idx') == [1, 2]
+    assert cur.hints == ['idx']
+
+
+def test_missing_index_is_not_hinted_and_miss_is_cached():
+    col = _Collection(set())
+
+    for _ in range(3):
+        cur = _Cursor(col, [1])
+        assert list_with_hint(cur, 'idx') == [1]
+        assert cur.hints == []
+    assert col.index_info_calls == 1
+
+
+def test_missing_index_is_rechecked_after_delay(monkeypatch):
+    col = _Collection(set())
+    clock = [1000.0]
+    monkeypatch.setattr(db_indexes.time, 'monotonic', lambda: clock[0])
+    assert not index_exists(col, 'idx')
+
+    col.indexes.add('idx')
+    assert not index_exists(col, 'idx')
+    clock[0] += db_indexes._INDEX_MISS_RECHECK_SECONDS + 1
+    assert index_exists(col, 'idx')
+
+
+def test_rejected_hint_falls_back_to_unhinted_query():
+    col = _Collection({'idx'})
+    cur = _Cursor(col, [1, 2], reject_hint=True)
+
+    assert list_with_hint(cur, 'idx') == [1, 2]
+    assert cur.rewound and cur.hints == ['idx', None]
+    # The rejected index is treated as missing until the recheck delay passes
+    nxt = _Cursor(col, [3])
+    assert list_with_hint(nxt, 'idx') == [3]
+    assert nxt.hints == []
+
+
+def test_no_hint_requested():
+    col = _Collection({'idx'})
+    cur = _Cursor(col, [1])
+
+    assert list_with_hint(cur, None) == [1]
+    assert cur.hints == [] and col.index_info_calls == 0
+
+
+def test_goal_listing_works_without_listing_indexes(db, user_id, monkeypatch):
+    monkeypatch.setattr(Config, 'MONGO_QUERY_HINTS', True)
+    for i, done in enumerate([False, True, False]):
+        db.goals.insert_one({'user_id': user_id, 'type': 'savings', 'target_amount': 10.0 + i, 'currency': 'USD',
+                             'description': f'g{i}', 'target_date': datetime(2027, 1, 1), 'is_completed': done,
+                             'created_at': datetime(2026, 1, 1 + i)})
+
+    listed = Goal.get_user_goals(user_id, db, sort_mode='created_desc')
+    active = Goal.get_active_goals(user_id, db)
+
+    assert [g.description for g in listed] == ['g2', 'g0', 'g1']
+    assert [g.description for g in active] == ['g2', 'g0']
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import pytest
+
+from models.goal import Goal, GoalInDB, _compress_ai_plan, _construct_goal, decode_ai_plan
+
+
+@pytest.mark.parametrize('text', ['', '<p>Save 50/week</p>', 'Plan: ৳ 5,000 → €42 ✓\n' * 200])
+def test_compress_decode_round_trip(text):
+    blob = _compress_ai_plan(text)
+
+    assert isinstance(blob, bytes)
+    assert decode_ai_plan(blob) == text
+
+
+def test_compress_shrinks_large_plans():
+    text = '<li class="mb-2">Move 200 to savings each payday.</li>\n' * 100
+    assert len(_compress_ai_plan(text)) < len(text.encode('utf-8')) // 5
+
+
+@pytest.mark.parametrize('legacy', [None, 'stored as plain text'])
+def test_decode_passes_legacy_values_through(legacy):
+    assert decode_ai_plan(legacy) == legacy
+
+
+def _doc(ai_plan):
+    return {'_id': '650000000000000000000009', 'user_id': 'u', 'type': 'savings', 'target_amount': 10.0,
+            'currency': 'usd', 'description': 'd', 'target_date': datetime(2027, 1, 1), 'ai_plan': ai_plan}
+
+
+def test_read_paths_decode_compressed_plan():
+    blob = _compress_ai_plan('<p>plan</p>')
+
+    assert GoalInDB(**_doc(blob)).ai_plan == '<p>plan</p>'
+    assert _construct_goal(_doc(blob)).ai_plan == '<p>plan</p>'
+    assert Goal.get_ai_plan(_doc(blob)) == '<p>plan</p>'
+    assert Goal.get_ai_plan(_doc('legacy')) == 'legacy'
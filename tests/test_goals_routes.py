@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from models.goal import GoalInDB, _compress_ai_plan
+from routes.goals import init_goals_blueprint
+
+
+def _goal(db, user_id, description, *, priority=None, completed=False, created_day=1, **extra):
+    doc = {'user_id': user_id, 'type': 'savings', 'target_amount': 100.0, 'currency': 'usd',
+           'description': description, 'target_date': datetime(2027, 1, 1), 'current_amount': 0.0,
+           'is_completed': completed, 'created_at': datetime(2026, 1, created_day), 'last_updated': datetime(2026, 1, 1)}
+    if priority is not None:
+        doc['ai_priority'] = priority
+    doc.update(extra)
+    return str(db.goals.insert_one(doc).inserted_id)
+
+
+def test_prioritized_route_order_and_shape(db, user_id, make_client):
+    low = _goal(db, user_id, 'low', priority=10)
+    done = _goal(db, user_id, 'done', priority=99, completed=True)
+    high = _goal(db, user_id, 'high', priority=80, ai_plan=_compress_ai_plan('<p>plan</p>'),
+                 ai_summary='long summary', ai_suggestions=['a'])
+    newer = _goal(db, user_id, 'newer', priority=10, created_day=5)
+    _goal(db, 'someone-else', 'other', priority=50)
+    client = make_client(lambda mongo: init_goals_blueprint(mongo, None, None))
+
+    resp = client.get('/api/goals/prioritized')
+
+    assert resp.status_code == 200
+    items = resp.get_json()
+    # Active goals by ai_priority desc then newest first; completed goals last
+    assert [g['_id'] for g in items] == [high, newer, low, done]
+    # Same keys as the GoalInDB dump the endpoint has always returned
+    expected_keys = {f.alias or name for name, f in GoalInDB.model_fields.items()}
+    assert all(set(g) == expected_keys for g in items)
+    top = items[0]
+    assert top['currency'] == 'USD'
+    assert top['ai_priority'] == 80
+    # Large text fields are not loaded for this listing
+    assert top['ai_plan'] is None and top['ai_summary'] is None and top['ai_suggestions'] is None
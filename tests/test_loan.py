@@ -0,0 +1,168 @@
+import logging
+from datetime import datetime
+
+import mongomock.collection
+import pytest
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+from models.loan import Loan
+
+UID = 'u1'
+
+
+def _strip_convert(expr):
+    """mongomock lacks $convert; treat it as $ifNull over the input (fine for numeric test data)."""
+    if isinstance(expr, dict):
+        if '$convert' in expr:
+            return {'$ifNull': [_strip_convert(expr['$convert']['input']), 0.0]}
+        return {k: _strip_convert(v) for k, v in expr.items()}
+    if isinstance(expr, list):
+        return [_strip_convert(v) for v in expr]
+    return expr
+
+
+@pytest.fixture
+def agg_db(db, monkeypatch):
+    orig = mongomock.collection.Collection.aggregate
+    monkeypatch.setattr(mongomock.collection.Collection, 'aggregate',
+                        lambda self, pipeline, **kw: orig(self, _strip_convert(pipeline), **kw))
+    return db
+
+
+@pytest.fixture
+def fallback_db(db, monkeypatch):
+    def fail(self, pipeline, **kw):
+        raise OperationFailure('$convert is not allowed')
+    monkeypatch.setattr(mongomock.collection.Collection, 'aggregate', fail)
+    return db
+
+
+def _tx(db, n, category, amount, day, base_currency=None, person='Ann'):
+    doc = {'_id': ObjectId('%024x' % n), 'user_id': UID, 'related_person': person, 'category': category,
+           'amount': amount, 'date': datetime(2026, 1, day)}
+    if base_currency is not None:
+        doc['base_currency'] = base_currency
+    db.transactions.insert_one(doc)
+    return doc['_id']
+
+
+def _seed(db):
+    # Inserted out of date order; the earliest currency-bearing tx is the taken-side one on day 2
+    ids = [
+        _tx(db, 5, 'lent out', 100.0, 9, 'usd'),
+        _tx(db, 3, 'repaid to me', 30.0, 12),
+        _tx(db, 7, 'borrowed', 50.0, 2, 'eur'),
+        _tx(db, 1, 'lent out', 20.0, 1, ''),
+        _tx(db, 4, 'repaid by me', 50.0, 3, 'bdt'),
+    ]
+    return ids
+
+
+def _loans(db):
+    return {d['direction']: d for d in db.loans.find({'user_id': UID, 'counterparty': 'Ann'})}
+
+
+@pytest.mark.parametrize('db_fixture', ['agg_db', 'fallback_db'])
+def test_recompute_counterparty_totals_and_base_currency(db_fixture, request):
+    db = request.getfixturevalue(db_fixture)
+    ids = _seed(db)
+
+    Loan.recompute_counterparty(UID, db, 'Ann')
+
+    loans = _loans(db)
+    given, taken = loans['given'], loans['taken']
+    assert (given['principal_amount'], given['outstanding_amount'], given['status']) == (120.0, 90.0, 'open')
+    assert (taken['principal_amount'], taken['outstanding_amount'], taken['status']) == (50.0, 0.0, 'closed')
+    # Transactions listed by (date, _id)
+    assert given['transactions'] == [ids[3], ids[0], ids[1]]
+    assert taken['transactions'] == [ids[2], ids[4]]
+    # Earliest non-empty base_currency across both directions wins, for both loans
+    assert given['base_currency'] == taken['base_currency'] == 'EUR'
+
+
+def test_recompute_counterparty_defaults_to_usd(agg_db):
+    _tx(agg_db, 1, 'lent out', 10.0, 1)
+
+    Loan.recompute_counterparty(UID, agg_db, 'Ann')
+
+    assert _loans(agg_db)['given']['base_currency'] == 'USD'
+
+
+def test_recompute_counterparty_logs_aggregate_failure(fallback_db, caplog):
+    _tx(fallback_db, 1, 'lent out', 10.0, 1, 'usd')
+
+    with caplog.at_level(logging.ERROR, logger='models.loan'):
+        Loan.recompute_counterparty(UID, fallback_db, 'Ann')
+
+    assert 'aggregate failed' in caplog.text
+    assert _loans(fallback_db)['given']['outstanding_amount'] == 10.0
+
+
+def test_recompute_counterparty_propagates_unexpected_errors(db, monkeypatch):
+    def boom(self, pipeline, **kw):
+        raise RuntimeError('boom')
+    monkeypatch.setattr(mongomock.collection.Collection, 'aggregate', boom)
+    _tx(db, 1, 'lent out', 10.0, 1)
+
+    with pytest.raises(RuntimeError):
+        Loan.recompute_counterparty(UID, db, 'Ann')
+
+
+def _process(db, category, amount, n, person='Bo', base_currency='usd'):
+    tx_id = ObjectId('%024x' % n)
+    Loan.process_transaction(UID, db, {'category': category, 'amount': amount, 'related_person': f' {person} ',
+                                       'base_currency': base_currency}, tx_id)
+    return tx_id
+
+
+def test_process_transaction_partial_repayment_keeps_loan_open(db):
+    lent = _process(db, 'lent out', 100.0, 1)
+    lent_again = _process(db, 'lent out', 20.0, 2)
+    repaid = _process(db, 'repaid to me', 45.5, 3)
+
+    loan = db.loans.find_one({'user_id': UID, 'counterparty': 'Bo'})
+    assert loan['direction'] == 'given'
+    assert (loan['principal_amount'], loan['outstanding_amount']) == (120.0, 74.5)
+    assert (loan['status'], loan['closed_at'], loan['base_currency']) == ('open', None, 'USD')
+    assert loan['transactions'] == [lent, lent_again, repaid]
+
+
+def test_process_transaction_does_not_duplicate_tx_ids(db):
+    lent = _process(db, 'lent out', 100.0, 1)
+    repaid = _process(db, 'repaid to me', 10.0, 2)
+    Loan.process_transaction(UID, db, {'category': 'repaid to me', 'amount': 10.0, 'related_person': 'Bo'}, repaid)
+
+    loan = db.loans.find_one({'user_id': UID, 'counterparty': 'Bo'})
+    assert loan['transactions'] == [lent, repaid]
+    assert loan['outstanding_amount'] == 80.0
+
+
+def test_process_transaction_overpayment_clamps_and_closes(db):
+    borrowed = _process(db, 'borrowed', 30.0, 1)
+    repaid = _process(db, 'repaid by me', 50.0, 2)
+    # Later repayments find no open loan and leave the closed one alone
+    Loan.process_transaction(UID, db, {'category': 'repaid by me', 'amount': 5.0, 'related_person': 'Bo'}, repaid)
+
+    loan = db.loans.find_one({'user_id': UID, 'counterparty': 'Bo', 'direction': 'taken'})
+    assert (loan['outstanding_amount'], loan['status']) == (0.0, 'closed')
+    assert loan['closed_at'] is not None
+    assert loan['transactions'] == [borrowed, repaid]
+
+
+def test_process_transaction_repayment_without_open_loan_is_ignored(db):
+    _process(db, 'repaid to me', 10.0, 1)
+    _process(db, 'lent out', 0.0, 2)
+    _process(db, 'food', 10.0, 3)
+
+    assert db.loans.count_documents({}) == 0
+
+
+def test_new_loan_after_close_starts_fresh(db):
+    _process(db, 'lent out', 10.0, 1)
+    _process(db, 'repaid to me', 10.0, 2)
+    third = _process(db, 'lent out', 7.0, 3)
+
+    loans = list(db.loans.find({'user_id': UID, 'counterparty': 'Bo'}).sort('status', 1))
+    assert [l['status'] for l in loans] == ['closed', 'open']
+    assert (loans[1]['principal_amount'], loans[1]['outstanding_amount'], loans[1]['transactions']) == (7.0, 7.0, [third])
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from models.goal import _compress_ai_plan
+from routes.profile import init_profile_blueprint
+
+
+def test_goals_export_decodes_compressed_ai_plan(db, user_id, make_client):
+    plan = '<h3>Plan</h3><p>Save 50 a week.</p>'
+    db.goals.insert_one({
+        'user_id': user_id, 'type': 'savings', 'target_amount': 500.0, 'currency': 'USD',
+        'description': 'Bike', 'target_date': datetime(2027, 1, 1), 'created_at': datetime(2026, 1, 1),
+        'ai_plan': _compress_ai_plan(plan),
+    })
+    client = make_client(init_profile_blueprint)
+
+    resp = client.post('/api/profile/export', json={'export_type': 'goals'})
+
+    assert resp.status_code == 200
+    items = resp.get_json()['items']
+    assert len(items) == 1
+    assert items[0]['ai_plan'] == plan
+    assert items[0]['description'] == 'Bike'
+
+
+def test_goals_export_passes_legacy_str_plan_through(db, user_id, make_client):
+    db.goals.insert_one({'user_id': user_id, 'description': 'Old', 'ai_plan': 'legacy text',
+                         'created_at': datetime(2026, 1, 1)})
+    client = make_client(init_profile_blueprint)
+
+    resp = client.post('/api/profile/export', json={'export_type': 'goals'})
+
+    assert resp.status_code == 200
+    assert resp.get_json()['items'][0]['ai_plan'] == 'legacy text'
@@ -211,7 +211,11 @@ class FinancialBrain:
                     t0 = time.perf_counter()
 
                     try:
-                        resp = self.client.models.generate_content(model=model, contents=prompt)
+                        # The SDK call is synchronous; run it on a worker thread so the
+                        # calling event loop keeps serving other coroutines meanwhile
+                        resp = await asyncio.to_thread(
+                            self.client.models.generate_content, model=model, contents=prompt
+                        )
                         text = (str(getattr(resp, "text", "")).strip() or "(empty AI response)")
                         self._validated_model = model
                         elapsed = (time.perf_counter() - t0) * 1000
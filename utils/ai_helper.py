@@ -52,7 +52,7 @@ def _strip(text: str, md_type: str) -> str:
     return FinancialBrain.strip_fences(text, md_type)
 
 
-def _compact_goal_with_local_currency(goal_dict: dict | GoalInDB, user: User, current_balance: float, include_ai_analysis=False) -> dict:
+def _compact_goal_with_local_currency(goal_dict: dict | GoalInDB, user: User, current_balance: float, include_ai_analysis=False, now_ts: float | None = None) -> dict:
     """Return a compact goal dict and convert current pool to the goal currency.
 
     The compact representation intentionally keeps AI-facing fields
@@ -60,7 +60,7 @@ def _compact_goal_with_local_currency(goal_dict: dict | GoalInDB, user: User, cu
     """
     from utils.currency import currency_service
     compact_goal = Goal.compact_dict(
-        goal_dict, include_ai_analysis=include_ai_analysis)
+        goal_dict, include_ai_analysis=include_ai_analysis, now_ts=now_ts)
     goal_currency = compact_goal["currency"]
 
     compact_goal[f"current_balance_in_{goal_currency}"] = currency_service.convert_amount(
@@ -69,7 +69,7 @@ def _compact_goal_with_local_currency(goal_dict: dict | GoalInDB, user: User, cu
     return compact_goal
 
 
-def _build_financial_context(user: User) -> dict:
+def build_financial_context(user: User) -> dict:
     """Assemble a compact financial context used by AI prompts.
 
     Tries to load several pre-computed summaries using a cache session to
@@ -143,15 +143,13 @@ def _build_financial_context(user: User) -> dict:
         except Exception:
             user_goal_sort = None
 
-        # Exclude heavy `ai_plan` text to keep tokens low. Use exclusion-only
-        # projection to avoid MongoDB errors caused by mixing inclusion and
-        # exclusion. See: OperationFailure when using mixed projections.
-        proj = {'ai_plan': 0}
+        # Default listing projection excludes heavy `ai_plan` text to keep tokens low.
         try:
             goals = Goal.get_active_goals(
-                user.id, db, sort_mode=user_goal_sort, projection=proj)
+                user.id, db, sort_mode=user_goal_sort)
+            now_ts = now_utc().timestamp()
             compact_goals = [_compact_goal_with_local_currency(
-                g, user, lifetime_summary.get("current_balance", 0)) for g in goals]
+                g, user, lifetime_summary.get("current_balance", 0), now_ts=now_ts) for g in goals]
         except Exception:
             traceback.print_exc()
             compact_goals = []
@@ -189,7 +187,7 @@ def _analysis_prompt(user: User) -> str:
 
     # Pull multi-period data using a single cached transaction load to reduce Mongo hits.
 
-    financial_context = _build_financial_context(user)
+    financial_context = build_financial_context(user)
 
     prompt = (
         "You are a helpful financial advisor.\n"
@@ -274,13 +272,15 @@ def _analysis_prompt(user: User) -> str:
     return prompt
 
 
-def _goal_priority_prompt(user: User, goal: dict) -> str:
+def _goal_priority_prompt(user: User, goal: dict, financial_context: dict | None = None) -> str:
     """Build a concise prompt asking the AI to score priority/urgency for one goal.
 
     The prompt instructs the model to return a strict JSON object only. We use
     `default_serializer` when dumping context so dates/ObjectIds remain readable.
+    A prebuilt `financial_context` may be passed to avoid rebuilding it.
     """
-    financial_context = _build_financial_context(user)
+    if financial_context is None:
+        financial_context = build_financial_context(user)
     compact_goal = _compact_goal_with_local_currency(
         goal, user, financial_context.get(
             "lifetime_summary", {}).get("current_balance", 0)
@@ -342,8 +342,9 @@ def get_ai_analysis(user: User) -> str:
     return _strip(raw, md_type="html")
 
 
-async def get_goal_plan(goal_dict: dict, user: User) -> str:
-    context = _build_financial_context(user)
+async def get_goal_plan(goal_dict: dict, user: User, context: dict | None = None) -> str:
+    if context is None:
+        context = build_financial_context(user)
 
     import math
 
@@ -518,7 +519,7 @@ def get_purchase_advice(
     (instead of providing a fallback to the engine itself) so issues are
     easier to detect and log.
     """
-    context = _build_financial_context(user)
+    context = build_financial_context(user)
     lifetime_summary = context["lifetime_summary"]
     last_3_months_summary = context["recent_3_months_summary"]
 
@@ -589,12 +590,13 @@ def get_purchase_advice(
     return data
 
 
-async def run_goal_priority_analysis(user: User, ai_engine: FinancialBrain, goal_dict: dict) -> dict:
+async def run_goal_priority_analysis(user: User, ai_engine: FinancialBrain, goal_dict: dict, context: dict | None = None) -> dict:
     """Async helper for goal priority analysis returning structured JSON.
 
-    Accepts an explicit engine (so callers can pass a shared instance).
+    Accepts an explicit engine (so callers can pass a shared instance) and an
+    optional prebuilt financial context (see `build_financial_context`).
     """
-    prompt = _goal_priority_prompt(user, goal_dict)
+    prompt = _goal_priority_prompt(user, goal_dict, context)
 
     fallback = {
         "priority_score": 50,
@@ -620,6 +622,7 @@ async def run_goal_priority_analysis(user: User, ai_engine: FinancialBrain, goal
     return data
 
 __all__ = [
+    'build_financial_context',
     'get_ai_analysis',
     'get_goal_plan',
     'get_purchase_advice',
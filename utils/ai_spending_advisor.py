@@ -32,9 +32,8 @@ class SpendingAdvisor:
         usual_income_date = user_doc.get('usual_income_date')
         # Respect user's saved goal sort when fetching active goals for context
         user_goal_sort = user_obj.get_sort_mode('goals')
-        # spending advisor only needs lightweight goal fields + ai_priority/urgency for context
-        proj = {'ai_plan': 0}
-        active_goals: list[GoalInDB] = Goal.get_active_goals(user_id, self.db, sort_mode=user_goal_sort, projection=proj)
+        # Default listing projection already skips the heavy ai_plan text
+        active_goals: list[GoalInDB] = Goal.get_active_goals(user_id, self.db, sort_mode=user_goal_sort)
 
         return get_purchase_advice(
             user=user_obj,
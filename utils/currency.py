@@ -467,6 +467,44 @@ class CurrencyService:
 			pass
 		return out_r
 
+	def get_rate(self, from_code: str, to_code: str) -> float:
+		"""Return the unrounded multiplier converting 1 unit of from_code into to_code.
+
+		Intended for hot loops that convert many amounts of the same pair: fetch
+		the rate once, then multiply. Unsupported or invalid pairs return 1.0,
+		mirroring convert_amount's pass-through behavior.
+		"""
+		try:
+			self.trigger_background_refresh_if_stale()
+		except Exception:
+			self._ensure_fresh()
+		if not self.is_supported(from_code) or not self.is_supported(to_code):
+			return 1.0
+		f = self._usd_per_unit.get(from_code.upper(), 0)
+		t = self._usd_per_unit.get(to_code.upper(), 0)
+		if f <= 0 or t <= 0:
+			return 1.0
+		return f / t
+
+	def get_rates_to(self, to_code: str, from_codes) -> Dict[str, float]:
+		"""Return {from_code: get_rate(from_code, to_code)} for a set of codes in one pass.
+
+		Codes are upper-cased in the result keys. Staleness is checked once for
+		the whole batch rather than per pair.
+		"""
+		try:
+			self.trigger_background_refresh_if_stale()
+		except Exception:
+			self._ensure_fresh()
+		to_u = (to_code or '').upper()
+		t = self._usd_per_unit.get(to_u, 0) if self.is_supported(to_u) else 0
+		out: Dict[str, float] = {}
+		for code in from_codes:
+			cu = (code or '').upper()
+			f = self._usd_per_unit.get(cu, 0) if self.is_supported(cu) else 0
+			out[cu] = f / t if (f > 0 and t > 0) else 1.0
+		return out
+
 	def background_initial_refresh(self):
 		"""Non-blocking initial refresh; intended to be run inside a thread started by the app."""
 		try:
@@ -16,10 +16,18 @@ cases, a warning is printed and the app continues running.
 
 from __future__ import annotations
 
+import time
 from typing import Any
 from pymongo import ASCENDING, DESCENDING
 from pymongo.errors import DuplicateKeyError, OperationFailure
 
+# Per-process record of which named indexes exist, used before hinting queries.
+# Confirmed indexes are remembered; misses are re-checked after a short delay
+# (the startup build may have failed, or still be running in the background).
+_INDEX_MISS_RECHECK_SECONDS = 60
+_confirmed_indexes: set[tuple[str, str, str]] = set()
+_missing_indexes: dict[tuple[str, str, str], float] = {}
+
 
 def _safe_create_index(col, keys, *, name: str | None = None, unique: bool = False, partialFilterExpression: dict | None = None) -> None:
     """Create index without sending null options to Mongo.
@@ -69,6 +77,14 @@ def ensure_indexes(db: Any) -> None:
     goals = db.goals
     _safe_create_index(goals, [("user_id", ASCENDING), ("is_completed", ASCENDING), ("created_at", DESCENDING)], name="user_active_created")
     _safe_create_index(goals, [("user_id", ASCENDING), ("ai_priority", DESCENDING)], name="user_ai_priority_desc")
+    # Goal listing sort modes (Goal.get_user_goals / get_active_goals). Listings always sort
+    # completed goals last, so each index is prefixed with is_completed to avoid an in-memory SORT.
+    _safe_create_index(goals, [("user_id", ASCENDING), ("is_completed", ASCENDING), ("created_at", ASCENDING)], name="user_active_created_asc")
+    _safe_create_index(goals, [("user_id", ASCENDING), ("is_completed", ASCENDING), ("target_date", ASCENDING), ("created_at", DESCENDING)], name="user_active_target_date")
+    _safe_create_index(goals, [("user_id", ASCENDING), ("is_completed", ASCENDING), ("target_date", DESCENDING), ("created_at", DESCENDING)], name="user_active_target_date_desc")
+    _safe_create_index(goals, [("user_id", ASCENDING), ("is_completed", ASCENDING), ("ai_priority", DESCENDING), ("target_date", ASCENDING), ("created_at", DESCENDING)], name="user_active_priority")
+    # Goal.get_prioritized: completed last, then ai_priority desc, newest first
+    _safe_create_index(goals, [("user_id", ASCENDING), ("is_completed", ASCENDING), ("ai_priority", DESCENDING), ("created_at", DESCENDING)], name="user_completed_priority_created")
 
     # loans
     loans = db.loans
@@ -128,3 +144,42 @@ def ensure_indexes(db: Any) -> None:
         print(f"[db-indexes] Warning creating diary category indexes: {_e}")
 
     print("[db-indexes] Index ensure complete.")
+
+
+def index_exists(col: Any, name: str) -> bool:
+    """Return True if the named index exists on col (cached per process)."""
+    key = (col.database.name, col.name, name)
+    if key in _confirmed_indexes:
+        return True
+    if _missing_indexes.get(key, 0.0) > time.monotonic():
+        return False
+    try:
+        present = name in col.index_information()
+    except Exception:
+        present = False
+    if present:
+        _confirmed_indexes.add(key)
+        _missing_indexes.pop(key, None)
+    else:
+        _missing_indexes[key] = time.monotonic() + _INDEX_MISS_RECHECK_SECONDS
+    return present
+
+
+def list_with_hint(cursor: Any, hint: str | None) -> list:
+    """Materialize an unread cursor, pinned to the hint index when it exists.
+
+    A missing index is never hinted. If the server still rejects the hint (index
+    dropped or not yet usable), the query is rerun without it instead of failing.
+    """
+    if hint and index_exists(cursor.collection, hint):
+        cursor.hint(hint)
+        try:
+            return list(cursor)
+        except OperationFailure:
+            col = cursor.collection
+            key = (col.database.name, col.name, hint)
+            _confirmed_indexes.discard(key)
+            _missing_indexes[key] = time.monotonic() + _INDEX_MISS_RECHECK_SECONDS
+            cursor.rewind()
+            cursor.hint(None)
+    return list(cursor)